@@ -0,0 +1,218 @@
+"""
+AgentSpace - SQLite Connection Pool
+
+Shared by the web app and the Discord bot so request handlers stop paying
+for a fresh sqlite3.connect() (file open, schema parse, cold page cache)
+on every query.
+
+Each pool holds:
+- One read/write connection (SQLite only allows one writer at a time)
+- A small set of read-only connections that proceed concurrently under WAL
+
+WriteBatcher sits on top of a pool and folds concurrent small writes into
+one transaction, so N status updates cost one commit instead of N.
+"""
+
+import itertools
+import queue
+from pathlib import Path
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+
+# ============================================================================
+# CONNECTION SETTINGS
+# ============================================================================
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+
+
+def _open_connection(path: str, row_factory=None, readonly: bool = False) -> sqlite3.Connection:
+    """
+    Open a connection usable from any thread and apply the pool PRAGMAs.
+    `readonly` opens with mode=ro, so SQLite rejects writes on that handle.
+    """
+    if readonly:
+        target, uri = Path(path).resolve().as_uri() + "?mode=ro", True
+    else:
+        target, uri = path, False
+    conn = sqlite3.connect(target, uri=uri, check_same_thread=False, isolation_level=None,
+                           cached_statements=256)
+    for pragma in _PRAGMAS:
+        conn.execute(pragma)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return conn
+
+
+# ============================================================================
+# POOL
+# ============================================================================
+
+class SQLitePool:
+    """
+    Lazily-opened pool: one writer connection plus `readers` read-only
+    connections.
+    `row_factory` (e.g. sqlite3.Row) is applied to every connection.
+
+    Writers use explicit transactions:
+
+        with pool.writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("UPDATE ...", params)
+            conn.execute("COMMIT")
+
+    writer() must not be nested: the one writer connection is already
+    checked out, so a nested call on the same thread raises RuntimeError.
+    Use the connection you already hold.
+    """
+
+    def __init__(self, path: str, readers: int = 4, row_factory=None):
+        self.path = path
+        self.readers = readers
+        self.row_factory = row_factory
+        self._init_lock = threading.Lock()
+        # Taken *before* the writer connection is handed out, so threads
+        # queue here instead of on SQLite's own file lock. Per pool: writers
+        # to different database files don't wait on each other
+        self._write_lock = threading.Lock()
+        self._write_owner = None
+        self._writer = None
+        self._read_pool = None
+
+    def _ensure_open(self):
+        if self._writer is not None:
+            return
+        with self._init_lock:
+            if self._writer is not None:
+                return
+            # Writer first: it creates the file and switches it to WAL,
+            # which the read-only connections cannot do themselves
+            writer = _open_connection(self.path, self.row_factory)
+            read_pool = queue.Queue()
+            for _ in range(self.readers):
+                read_pool.put(_open_connection(self.path, self.row_factory, readonly=True))
+            self._read_pool = read_pool
+            self._writer = writer
+
+    @contextmanager
+    def writer(self):
+        """Check out the single read/write connection. Not reentrant."""
+        if self._write_owner == threading.get_ident():
+            raise RuntimeError("SQLitePool.writer() is already held by this thread")
+        with self._write_lock:
+            self._write_owner = threading.get_ident()
+            try:
+                self._ensure_open()
+                conn = self._writer
+                try:
+                    yield conn
+                except Exception:
+                    if conn.in_transaction:
+                        conn.execute("ROLLBACK")
+                    raise
+            finally:
+                self._write_owner = None
+
+    @contextmanager
+    def reader(self):
+        """Check out one of the read connections."""
+        self._ensure_open()
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+
+# ============================================================================
+# WRITE BATCHING
+# ============================================================================
+
+class WriteBatcher:
+    """
+    Background write-combiner over a SQLitePool.
+
+    submit() queues one statement and returns a Future that resolves once
+    the transaction containing it commits (or fails). A single daemon
+    thread drains the queue, collecting up to `max_batch` statements or
+    whatever arrives within `interval` seconds of the first one. If the
+    batch fails, each statement is retried in its own transaction, so one
+    bad statement only fails its own Future:
+
+        _db_batcher.submit(SQL, params).result()
+    """
+
+    def __init__(self, pool: SQLitePool, max_batch: int = 32, interval: float = 0.05):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.interval = interval
+        self._queue = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, sql: str, params=()) -> Future:
+        """Queue a write; the returned Future resolves after COMMIT."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((sql, params, future))
+        return future
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._drain, name="sqlite-write-batcher", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _drain(self):
+        while True:
+            batch = [self._queue.get()]
+            # Fixed window from the first statement; a per-get timeout would
+            # keep sliding while writes trickle in
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        try:
+            with self.pool.writer() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Consecutive writes of the same statement go through executemany
+                for sql, group in itertools.groupby(batch, key=lambda item: item[0]):
+                    conn.executemany(sql, [params for _, params, _ in group])
+                conn.execute("COMMIT")
+        except Exception:
+            # writer() has rolled the batch back; isolate the bad statement(s)
+            for item in batch:
+                self._commit_one(*item)
+        else:
+            for _, _, future in batch:
+                future.set_result(None)
+
+    def _commit_one(self, sql, params, future):
+        try:
+            with self.pool.writer() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(sql, params)
+                conn.execute("COMMIT")
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
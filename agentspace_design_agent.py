@@ -12,12 +12,20 @@ This agent:
 - Creates complete design specifications
 """
 
+import re
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from agentspace_design_styles import (
     ColorPalette, TypographyStyle, LayoutStyle, DesignSystem,
-    extract_colors_from_brand
+    extract_colors_from_brand, get_design_system
 )
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 
 # ============================================================================
 # DESIGN AGENT PROMPT
@@ -39,19 +47,32 @@ Base your recommendations on:
 Provide specific, actionable design recommendations."""
 
 
-def get_design_recommendations_prompt(company_data: Dict[str, Any]) -> str:
-    """Generate prompt for design recommendations."""
+def _prompt_key(company_data: Dict[str, Any]) -> tuple:
+    """Project company_data onto the hashable fields the prompt actually uses."""
+    return (
+        company_data.get('company_name'),
+        company_data.get('industry'),
+        company_data.get('target_audience_description'),
+        tuple(company_data.get('brand_personality_adjectives', [])),
+        company_data.get('tone_preferences'),
+        tuple(company_data.get('main_competitors', [])),
+    )
+
+
+@lru_cache(maxsize=256)
+def _prompt_for(key: tuple) -> str:
+    company_name, industry, audience, personality, tone, competitors = key
     
     prompt = f"""
 Analyze this company and recommend visual design choices for their marketing kit.
 
 COMPANY INFORMATION:
-Company: {company_data.get('company_name')}
-Industry: {company_data.get('industry')}
-Target Audience: {company_data.get('target_audience_description')}
-Brand Personality: {', '.join(company_data.get('brand_personality_adjectives', []))}
-Tone: {company_data.get('tone_preferences')}
-Competitors: {', '.join(company_data.get('main_competitors', []))}
+Company: {company_name}
+Industry: {industry}
+Target Audience: {audience}
+Brand Personality: {', '.join(personality)}
+Tone: {tone}
+Competitors: {', '.join(competitors)}
 
 Recommend:
 
@@ -80,6 +101,130 @@ Be specific. If brand colors exist, use them. Match industry expectations while
     return prompt
 
 
+def get_design_recommendations_prompt(company_data: Dict[str, Any]) -> str:
+    """Generate prompt for design recommendations."""
+    key = _prompt_key(company_data)
+    try:
+        return _prompt_for(key)
+    except TypeError:
+        # Unhashable field (e.g. tone passed as a list) - build without caching
+        return _prompt_for.__wrapped__(key)
+
+
+# ============================================================================
+# KEYWORD CLASSIFIERS
+# ============================================================================
+
+# (result, keywords) buckets, checked in order - the first bucket with a
+# keyword anywhere in the text wins. Matching is substring-based, so
+# "health" still catches "Healthcare Technology".
+_COLOR_BUCKETS = (
+    ("healthcare_professional", frozenset({'trust', 'corporate', 'professional', 'navy', 'blue'})),
+    ("creative_bold", frozenset({'bold', 'creative', 'orange', 'vibrant'})),
+    ("tech_modern", frozenset({'tech', 'modern', 'purple', 'innovation'})),
+    ("finance_trust", frozenset({'conservative', 'finance', 'traditional'})),
+)
+_TYPOGRAPHY_BUCKETS = (
+    ("professional_serif", frozenset({'serif', 'classic', 'traditional', 'elegant'})),
+    ("tech_sans", frozenset({'sans', 'modern', 'clean', 'minimal'})),
+    ("elegant_mixed", frozenset({'mixed', 'sophisticated'})),
+)
+_LAYOUT_BUCKETS = (
+    ("spacious", frozenset({'spacious', 'airy', 'premium'})),
+    ("compact", frozenset({'compact', 'efficient', 'dense'})),
+    ("magazine", frozenset({'magazine', 'creative', 'editorial'})),
+)
+_INDUSTRY_BUCKETS = (
+    ("healthcare_professional", frozenset({'health', 'medical', 'hospital', 'care'})),
+    ("tech_startup", frozenset({'tech', 'software', 'saas', 'ai'})),
+    ("finance_corporate", frozenset({'finance', 'bank', 'investment', 'insurance'})),
+    ("creative_agency", frozenset({'creative', 'agency', 'design', 'marketing'})),
+)
+_MINIMAL_PERSONALITY = frozenset({'minimal', 'clean', 'simple'})
+
+
+def _compile_buckets(buckets):
+    """One alternation regex per bucket, so each bucket is a single C-level scan."""
+    return tuple(
+        (name, re.compile('|'.join(map(re.escape, sorted(words)))))
+        for name, words in buckets
+    )
+
+
+_COLOR_RULES = _compile_buckets(_COLOR_BUCKETS)
+_TYPOGRAPHY_RULES = _compile_buckets(_TYPOGRAPHY_BUCKETS)
+_LAYOUT_RULES = _compile_buckets(_LAYOUT_BUCKETS)
+_INDUSTRY_RULES = _compile_buckets(_INDUSTRY_BUCKETS)
+
+
+def _classify(text: str, rules, default: Optional[str] = None) -> Optional[str]:
+    """Return the first bucket whose keywords appear in text."""
+    for name, pattern in rules:
+        if pattern.search(text):
+            return name
+    return default
+
+
+# LLM recommendations are classified on three axes at once:
+# (axis, buckets, default, regex fallback rules)
+_RECOMMENDATION_AXES = (
+    ("color", _COLOR_BUCKETS, "swift_innovation", _COLOR_RULES),
+    ("typography", _TYPOGRAPHY_BUCKETS, "swift_modern", _TYPOGRAPHY_RULES),
+    ("layout", _LAYOUT_BUCKETS, "standard", _LAYOUT_RULES),
+)
+
+
+def _build_automaton(axes):
+    """One Aho-Corasick automaton over every keyword, tagged with (axis, bucket)."""
+    tags = {}
+    for axis, buckets, _, _ in axes:
+        for name, words in buckets:
+            for word in words:
+                tags.setdefault(word, []).append((axis, name))
+    automaton = ahocorasick.Automaton()
+    for word, word_tags in tags.items():
+        automaton.add_word(word, tuple(word_tags))
+    automaton.make_automaton()
+    return automaton
+
+
+_RECOMMENDATION_AUTOMATON = _build_automaton(_RECOMMENDATION_AXES) if AHOCORASICK_AVAILABLE else None
+
+
+def _classify_recommendations(text: str) -> tuple:
+    """Classify text into (color_palette, typography, layout) in a single scan."""
+    if _RECOMMENDATION_AUTOMATON is None:
+        return tuple(_classify(text, rules, default) for _, _, default, rules in _RECOMMENDATION_AXES)
+    
+    hits = set()
+    for _, word_tags in _RECOMMENDATION_AUTOMATON.iter(text):
+        hits.update(word_tags)
+    # Bucket order still decides ties, as with the per-bucket regexes
+    return tuple(
+        next((name for name, _ in buckets if (axis, name) in hits), default)
+        for axis, buckets, default, _ in _RECOMMENDATION_AXES
+    )
+
+
+@lru_cache(maxsize=256)
+def _rules_for(industry: str, personality: tuple) -> Dict[str, Any]:
+    """Rule-based design recommendation for a lowercased industry/personality pair."""
+    
+    # Industry-based defaults
+    system_name = _classify(industry, _INDUSTRY_RULES)
+    if system_name is None:
+        if not _MINIMAL_PERSONALITY.isdisjoint(personality):
+            system_name = "minimal_modern"
+        else:
+            system_name = "swift_innovation"
+    
+    return {
+        "recommended_system": system_name,
+        "design_system": get_design_system(system_name),
+        "reasoning": f"Based on {industry} industry and {', '.join(personality[:2])} personality"
+    }
+
+
 # ============================================================================
 # DESIGN AGENT
 # ============================================================================
@@ -142,37 +287,7 @@ class DesignAgent:
         
         recs_lower = recommendations.lower()
         
-        # Determine color mood
-        if any(word in recs_lower for word in ['trust', 'corporate', 'professional', 'navy', 'blue']):
-            color_palette = "healthcare_professional"
-        elif any(word in recs_lower for word in ['bold', 'creative', 'orange', 'vibrant']):
-            color_palette = "creative_bold"
-        elif any(word in recs_lower for word in ['tech', 'modern', 'purple', 'innovation']):
-            color_palette = "tech_modern"
-        elif any(word in recs_lower for word in ['conservative', 'finance', 'traditional']):
-            color_palette = "finance_trust"
-        else:
-            color_palette = "swift_innovation"
-        
-        # Determine typography
-        if any(word in recs_lower for word in ['serif', 'classic', 'traditional', 'elegant']):
-            typography = "professional_serif"
-        elif any(word in recs_lower for word in ['sans', 'modern', 'clean', 'minimal']):
-            typography = "tech_sans"
-        elif any(word in recs_lower for word in ['mixed', 'sophisticated']):
-            typography = "elegant_mixed"
-        else:
-            typography = "swift_modern"
-        
-        # Determine layout
-        if any(word in recs_lower for word in ['spacious', 'airy', 'premium']):
-            layout = "spacious"
-        elif any(word in recs_lower for word in ['compact', 'efficient', 'dense']):
-            layout = "compact"
-        elif any(word in recs_lower for word in ['magazine', 'creative', 'editorial']):
-            layout = "magazine"
-        else:
-            layout = "standard"
+        color_palette, typography, layout = _classify_recommendations(recs_lower)
         
         return {
             "color_palette": color_palette,
@@ -186,30 +301,10 @@ class DesignAgent:
         """Generate design recommendations based on rules."""
         
         industry = company_data.get('industry', '').lower()
-        personality = [p.lower() for p in company_data.get('brand_personality_adjectives', [])]
+        personality = tuple(p.lower() for p in company_data.get('brand_personality_adjectives', []))
         
-        # Industry-based defaults
-        if any(word in industry for word in ['health', 'medical', 'hospital', 'care']):
-            system_name = "healthcare_professional"
-        elif any(word in industry for word in ['tech', 'software', 'saas', 'ai']):
-            system_name = "tech_startup"
-        elif any(word in industry for word in ['finance', 'bank', 'investment', 'insurance']):
-            system_name = "finance_corporate"
-        elif any(word in industry for word in ['creative', 'agency', 'design', 'marketing']):
-            system_name = "creative_agency"
-        elif any(word in personality for word in ['minimal', 'clean', 'simple']):
-            system_name = "minimal_modern"
-        else:
-            system_name = "swift_innovation"
-        
-        from agentspace_design_styles import get_design_system
-        system = get_design_system(system_name)
-        
-        return {
-            "recommended_system": system_name,
-            "design_system": system,
-            "reasoning": f"Based on {industry} industry and {', '.join(personality[:2])} personality"
-        }
+        # Copy so callers can't mutate the cached entry
+        return dict(_rules_for(industry, personality))
     
     def _map_to_design_system(self, color_palette: str, typography: str, layout: str, company_data: Dict) -> str:
         """Map components to closest pre-built design system."""
@@ -13,15 +13,14 @@ Use this to match client brand guidelines or create new visual identities.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple, Optional
-from docx.shared import RGBColor, Pt, Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 
 # ============================================================================
 # COLOR SYSTEM
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ColorPalette:
 	"""Brand color palette."""
 	name: str
@@ -95,7 +94,7 @@ DESIGN_PALETTES = {
 # TYPOGRAPHY SYSTEM
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TypographyStyle:
 	"""Typography system for the marketing kit."""
 	name: str
@@ -164,7 +163,7 @@ TYPOGRAPHY_STYLES = {
 # LAYOUT SYSTEM
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LayoutStyle:
 	"""Page layout and spacing system."""
 	name: str
@@ -233,7 +232,7 @@ LAYOUT_STYLES = {
 # COMPLETE DESIGN SYSTEM
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DesignSystem:
 	"""Complete visual design system for a marketing kit."""
 	name: str
@@ -291,13 +290,16 @@ DESIGN_SYSTEMS = {
 # HELPER FUNCTIONS
 # ============================================================================
 
+_DESIGN_SYSTEM_NAMES = tuple(DESIGN_SYSTEMS.keys())
+
+@lru_cache(maxsize=None)
 def get_design_system(name: str) -> DesignSystem:
 	"""Get a design system by name."""
 	return DESIGN_SYSTEMS.get(name, DESIGN_SYSTEMS["swift_innovation"])
 
-def list_design_systems() -> list:
+def list_design_systems() -> tuple:
 	"""List all available design systems."""
-	return list(DESIGN_SYSTEMS.keys())
+	return _DESIGN_SYSTEM_NAMES
 
 def create_custom_design_system(
 	name: str,
@@ -317,14 +319,16 @@ def create_custom_design_system(
 		description=description
 	)
 
+def _hex_to_rgb(hex_color: str) -> tuple:
+	"""'#2980b9' -> (41, 128, 185); bytes.fromhex parses all channels in one call."""
+	r, g, b = bytes.fromhex(hex_color.lstrip('#'))[:3]
+	return (r, g, b)
+
 def extract_colors_from_brand(hex_colors: list) -> ColorPalette:
 	"""
 	Create a color palette from brand colors (hex codes).
 	"""
-	def hex_to_rgb(hex_color: str) -> tuple:
-		hex_color = hex_color.lstrip('#')
-		return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-	rgb_colors = [hex_to_rgb(c) for c in hex_colors]
+	rgb_colors = [_hex_to_rgb(c) for c in hex_colors]
 	primary = rgb_colors[0] if len(rgb_colors) > 0 else (41, 128, 185)
 	secondary = rgb_colors[1] if len(rgb_colors) > 1 else (231, 76, 60)
 	return ColorPalette(
@@ -337,32 +341,42 @@ def extract_colors_from_brand(hex_colors: list) -> ColorPalette:
 		muted=(149, 165, 166)
 	)
 
-def preview_design_system(design_system: DesignSystem) -> str:
-	"""
-	Generate a text preview of a design system.
-	"""
-	preview = f"""
-DESIGN SYSTEM: {design_system.name}
-{design_system.description}
+_PREVIEW_TEMPLATE = """
+DESIGN SYSTEM: {name}
+{description}
 
 COLORS:
-  Primary:   RGB{design_system.colors.primary}
-  Secondary: RGB{design_system.colors.secondary}
-  Dark:      RGB{design_system.colors.dark}
-  Light:     RGB{design_system.colors.light}
-  Text:      RGB{design_system.colors.text}
+  Primary:   RGB{colors.primary}
+  Secondary: RGB{colors.secondary}
+  Dark:      RGB{colors.dark}
+  Light:     RGB{colors.light}
+  Text:      RGB{colors.text}
 
 TYPOGRAPHY:
-  Headings: {design_system.typography.heading_font}
-  Body:     {design_system.typography.body_font}
-  H1 Size:  {design_system.typography.h1_size}pt
-  H2 Size:  {design_system.typography.h2_size}pt
-  Body Size: {design_system.typography.body_size}pt
+  Headings: {typography.heading_font}
+  Body:     {typography.body_font}
+  H1 Size:  {typography.h1_size}pt
+  H2 Size:  {typography.h2_size}pt
+  Body Size: {typography.body_size}pt
 
 LAYOUT:
-  Margins: {design_system.layout.top_margin}" top/bottom, {design_system.layout.left_margin}" left/right
-  Section Spacing: {design_system.layout.section_spacing_before}pt before
-  Dividers: {'Yes' if design_system.layout.use_section_dividers else 'No'}
-  Header/Footer: {'Yes' if design_system.layout.use_header_footer else 'No'}
-"""
-	return preview
+  Margins: {layout.top_margin}" top/bottom, {layout.left_margin}" left/right
+  Section Spacing: {layout.section_spacing_before}pt before
+  Dividers: {dividers}
+  Header/Footer: {header_footer}
+""".format
+
+def preview_design_system(design_system: DesignSystem) -> str:
+	"""
+	Generate a text preview of a design system.
+	"""
+	layout = design_system.layout
+	return _PREVIEW_TEMPLATE(
+		name=design_system.name,
+		description=design_system.description,
+		colors=design_system.colors,
+		typography=design_system.typography,
+		layout=layout,
+		dividers='Yes' if layout.use_section_dividers else 'No',
+		header_footer='Yes' if layout.use_header_footer else 'No'
+	)
@@ -8,14 +8,23 @@ Allows users to interact with AgentSpace via Discord:
 - Check request status
 """
 
+import asyncio
+import functools
+import io
+import logging
+import sys
+import threading
+import time
 import discord
 from discord import app_commands
 from discord.ext import commands
 import os
-import json
 from datetime import datetime
 from pathlib import Path
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+from agentspace_db import SQLitePool
 
 # Load environment variables from .env
 from dotenv import load_dotenv
@@ -25,6 +34,11 @@ load_dotenv()
 from agentspace_agentbuilder import generate_marketing_kit
 # Remove legacy import and use AgentBuilder workflow
 from agentspace_docx_generator import generate_marketing_kit_docx
+from agentspace_files import safe_filename, write_json
+# Same enrichment/validation/generation pipeline as the web app
+from agentspace_scrapers import analyze_all_sources
+from agentspace_inputs import prepare_inputs_with_defaults
+from agentspace_main_AI import run_marketing_kit_generation_AI
 
 # Bot setup
 intents = discord.Intents.default()
@@ -32,6 +46,7 @@ intents.message_content = True
 intents.members = True
 
 bot = commands.Bot(command_prefix='!', intents=intents)
+logger = logging.getLogger("agentspace.discord")
 
 # Configuration
 UPLOAD_FOLDER = 'discord_uploads'
@@ -41,74 +56,324 @@ DB_PATH = 'agentspace_discord.db'
 Path(UPLOAD_FOLDER).mkdir(exist_ok=True)
 Path(OUTPUT_FOLDER).mkdir(exist_ok=True)
 
+# Shared connection pool (opened on first use); rows support req['column']
+_db_pool = SQLitePool(DB_PATH, row_factory=sqlite3.Row)
+
+# Request status -> display, computed once rather than per row
+STATUS_EMOJI = {
+    'pending': '⏳',
+    'processing': '⚙️',
+    'completed': '✅',
+    'failed': '❌',
+}
+STATUS_TITLE = {status: status.title() for status in STATUS_EMOJI}
+
+# Kit generation (LLM calls, DOCX build) runs here, off the gateway loop
+_kit_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="kit")
+
+# SQLite allows one writer at a time, so writes get one dedicated thread
+# instead of parking default-executor workers on the pool's write lock
+_db_write_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-write")
+
+def _clean_csv(text: str) -> list:
+    """Split "a , b,,c" into ['a', 'b', 'c'] with C-level map/filter."""
+    return list(filter(None, map(str.strip, text.split(','))))
+
 
 # ============================================================================
 # DATABASE
 # ============================================================================
 
+# Whole schema in one script: parsed in one call, committed as one unit
+_SCHEMA_SQL = """
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS discord_users (
+    discord_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS discord_requests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    discord_id TEXT NOT NULL,
+    guild_id TEXT,
+    channel_id TEXT,
+    request_type TEXT NOT NULL,
+    client_name TEXT NOT NULL,
+    website TEXT,
+    offerings TEXT,
+    competitors TEXT,
+    additional_info TEXT,
+    status TEXT DEFAULT 'pending',
+    json_output_path TEXT,
+    docx_output_path TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP,
+    FOREIGN KEY (discord_id) REFERENCES discord_users (discord_id)
+);
+
+CREATE TABLE IF NOT EXISTS discord_files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    request_id INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    filepath TEXT NOT NULL,
+    file_type TEXT,
+    uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (request_id) REFERENCES discord_requests (id)
+);
+
+-- Per-user lookups (history, pending request) and the file list
+CREATE INDEX IF NOT EXISTS idx_req_user_created ON discord_requests (discord_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_req_user_status_created ON discord_requests (discord_id, status, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_files_request ON discord_files (request_id);
+
+COMMIT;
+
+-- Refresh planner statistics for the indexes above (cheap no-op when current)
+PRAGMA optimize;
+"""
+
+
 def init_discord_db():
     """Initialize Discord bot database."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    
-    # Discord users table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS discord_users (
-            discord_id TEXT PRIMARY KEY,
-            username TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    
-    # Discord requests table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS discord_requests (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            discord_id TEXT NOT NULL,
-            guild_id TEXT,
-            channel_id TEXT,
-            request_type TEXT NOT NULL,
-            client_name TEXT NOT NULL,
-            website TEXT,
-            offerings TEXT,
-            competitors TEXT,
-            additional_info TEXT,
-            status TEXT DEFAULT 'pending',
-            json_output_path TEXT,
-            docx_output_path TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            completed_at TIMESTAMP,
-            FOREIGN KEY (discord_id) REFERENCES discord_users (discord_id)
-        )
-    ''')
-    
-    # Discord files table
-    c.execute('''
-        CREATE TABLE IF NOT EXISTS discord_files (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            request_id INTEGER NOT NULL,
-            filename TEXT NOT NULL,
-            filepath TEXT NOT NULL,
-            file_type TEXT,
-            uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (request_id) REFERENCES discord_requests (id)
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    with _db_pool.writer() as conn:
+        conn.executescript(_SCHEMA_SQL)
 
 
 def register_discord_user(discord_id: str, username: str):
     """Register or update a Discord user."""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        INSERT OR REPLACE INTO discord_users (discord_id, username)
-        VALUES (?, ?)
-    ''', (discord_id, username))
-    conn.commit()
-    conn.close()
+    with _db_pool.writer() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        # Upsert: a repeat registration with the same name writes nothing,
+        # and an existing row keeps its created_at
+        conn.execute('''
+            INSERT INTO discord_users (discord_id, username)
+            VALUES (?, ?)
+            ON CONFLICT(discord_id) DO UPDATE SET username = excluded.username
+            WHERE username <> excluded.username
+        ''', (discord_id, username))
+        conn.execute('COMMIT')
+
+
+# ============================================================================
+# LOOKUP CACHE
+# ============================================================================
+
+class _TTLCache:
+    """
+    Small dict-backed cache whose entries expire `ttl` seconds after being set.
+
+    pop()/clear() bump a generation counter. A reader takes generation()
+    before its query and passes it to set(), which drops the fill if an
+    invalidation ran in between, so a stale row can't be cached after it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = {}
+        self._generation = 0
+        self._lock = threading.Lock()   # helpers run on to_thread workers
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value, generation=None):
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if len(self._data) >= self.maxsize:
+                # Evict the oldest insertion
+                del self._data[next(iter(self._data))]
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def pop(self, key):
+        with self._lock:
+            self._generation += 1
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+
+# /my-requests lists keyed by discord_id, and /download rows keyed by
+# (request_id, discord_id). Only completed downloads are cached; the
+# status-changing helpers below invalidate.
+_LIST_CACHE = _TTLCache(maxsize=1024, ttl=30)
+_DOWNLOAD_CACHE = _TTLCache(maxsize=4096, ttl=30)
+
+
+# Blocking query helpers. Async handlers run reads through asyncio.to_thread
+# and writes through _db_write, so SQLite I/O never stalls the gateway loop.
+
+async def _db_write(fn, *args):
+    """Run a blocking write helper on the single DB writer thread."""
+    return await asyncio.get_running_loop().run_in_executor(_db_write_executor, fn, *args)
+
+
+def _insert_request(discord_id, guild_id, channel_id, request_type, client_name,
+                    website, offerings, competitors, additional_info) -> int:
+    """Create a pending request and return its id."""
+    with _db_pool.writer() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        c = conn.execute('''
+            INSERT INTO discord_requests 
+            (discord_id, guild_id, channel_id, request_type, client_name, website, offerings, competitors, additional_info, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
+        ''', (discord_id, guild_id, channel_id, request_type, client_name,
+              website, offerings, competitors, additional_info))
+        conn.execute('COMMIT')
+    _LIST_CACHE.pop(discord_id)
+    return c.lastrowid
+
+
+def _claim_request(request_id: int, discord_id: str):
+    """Mark a user's request as processing and return its details (or None)."""
+    with _db_pool.writer() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('''
+            UPDATE discord_requests SET status = 'processing' WHERE id = ? AND discord_id = ?
+        ''', (request_id, discord_id))
+        conn.execute('COMMIT')
+        _LIST_CACHE.pop(discord_id)
+        _DOWNLOAD_CACHE.pop((request_id, discord_id))
+        return conn.execute('''
+            SELECT client_name, request_type, website, offerings, competitors, additional_info FROM discord_requests WHERE id = ? AND discord_id = ?
+        ''', (request_id, discord_id)).fetchone()
+
+
+def _get_download(request_id: int, discord_id: str):
+    """Return (status, docx_output_path, client_name) for a user's request."""
+    key = (request_id, discord_id)
+    row = _DOWNLOAD_CACHE.get(key)
+    if row is not None:
+        return row
+    generation = _DOWNLOAD_CACHE.generation()
+    with _db_pool.reader() as conn:
+        row = conn.execute('''
+            SELECT status, docx_output_path, client_name
+            FROM discord_requests
+            WHERE id = ? AND discord_id = ?
+        ''', (request_id, discord_id)).fetchone()
+    if row is not None and row['status'] == 'completed':
+        _DOWNLOAD_CACHE.set(key, row, generation)
+    return row
+
+
+def _pending_request_id(discord_id: str):
+    """Return the user's most recent pending request id, if any."""
+    with _db_pool.reader() as conn:
+        row = conn.execute('''
+            SELECT id FROM discord_requests
+            WHERE discord_id = ? AND status = 'pending'
+            ORDER BY created_at DESC
+            LIMIT 1
+        ''', (discord_id,)).fetchone()
+    return row[0] if row else None
+
+
+_INSERT_FILE_SQL = """
+    INSERT INTO discord_files (request_id, filename, filepath, file_type)
+    VALUES (?, ?, ?, ?)
+"""
+
+
+def _save_attachment_rows(rows: list):
+    """Record saved attachments as (request_id, filename, filepath, file_type) rows."""
+    with _db_pool.writer() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(_INSERT_FILE_SQL, rows)
+        conn.execute('COMMIT')
+
+
+def _list_requests(discord_id: str) -> list:
+    """Return the user's ten most recent requests, newest first."""
+    requests = _LIST_CACHE.get(discord_id)
+    if requests is not None:
+        return requests
+    generation = _LIST_CACHE.generation()
+    with _db_pool.reader() as conn:
+        requests = conn.execute('''
+            SELECT id, client_name, request_type, status, created_at
+            FROM discord_requests
+            WHERE discord_id = ?
+            ORDER BY created_at DESC
+            LIMIT 10
+        ''', (discord_id,)).fetchall()
+    _LIST_CACHE.set(discord_id, requests, generation)
+    return requests
+
+
+def _read_file(path: str):
+    """Return the file's bytes, or None if it doesn't exist."""
+    try:
+        return Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _remove_files(paths):
+    """Delete the given files, skipping any that don't exist."""
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _request_files(request_id: int) -> list:
+    """Return the uploaded file paths for a request."""
+    with _db_pool.reader() as conn:
+        c = conn.execute('SELECT filepath FROM discord_files WHERE request_id = ?', (request_id,))
+        return [row[0] for row in c.fetchall()]
+
+
+def _mark_failed(request_id: int, json_path: str):
+    """Record a failed request and its error JSON."""
+    with _db_pool.writer() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('''
+            UPDATE discord_requests
+            SET status = 'failed',
+                json_output_path = ?,
+                docx_output_path = NULL,
+                completed_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (json_path, request_id))
+        conn.execute('COMMIT')
+    # No discord_id here; status changes are rare, so drop every cached list
+    _LIST_CACHE.clear()
+
+
+def _mark_completed(request_id: int, json_path: str, docx_path: str):
+    """Record a completed request and its output files."""
+    with _db_pool.writer() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        conn.execute('''
+            UPDATE discord_requests
+            SET status = 'completed',
+                json_output_path = ?,
+                docx_output_path = ?,
+                completed_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (json_path, docx_path, request_id))
+        conn.execute('COMMIT')
+    _LIST_CACHE.clear()
 
 
 # ============================================================================
@@ -118,16 +383,15 @@ def register_discord_user(discord_id: str, username: str):
 @bot.event
 async def on_ready():
     """Bot startup."""
-    print(f'✓ {bot.user} is now online!')
-    print(f'  Connected to {len(bot.guilds)} server(s)')
+    logger.info("✓ %s is now online! Connected to %d server(s)", bot.user, len(bot.guilds))
     
     # Sync slash commands
     try:
         guild = discord.Object(id=1097296150014464163)
         synced = await bot.tree.sync(guild=guild)
-        print(f'✓ Synced {len(synced)} command(s) to guild {guild.id}')
+        logger.info("✓ Synced %d command(s) to guild %s", len(synced), guild.id)
     except Exception as e:
-        print(f'Failed to sync commands: {e}')
+        logger.warning("Failed to sync commands: %s", e)
     
     # Set status
     await bot.change_presence(
@@ -138,24 +402,32 @@ async def on_ready():
     )
 
 
+# Embed colours as raw ints for the per-request Embed.from_dict payloads
+_ORANGE = discord.Color.orange().value
+_GREEN = discord.Color.green().value
+
+
+# Static embed, built once and reused for every new member
+_WELCOME_EMBED = discord.Embed(
+    title="👋 Welcome to AgentSpace!",
+    description=(
+        "I'm your AI-powered marketing kit generator.\n\n"
+        "**Get Started:**\n"
+        "• Use `/new-request` to create a marketing kit\n"
+        "• Use `/my-requests` to see your history\n"
+        "• Use `/help` for more commands\n\n"
+        "Let's build something amazing!"
+    ),
+    color=discord.Color.blue()
+)
+
+
 @bot.event
 async def on_member_join(member):
     """Welcome new members."""
     # Send welcome DM
     try:
-        embed = discord.Embed(
-            title="👋 Welcome to AgentSpace!",
-            description=(
-                "I'm your AI-powered marketing kit generator.\n\n"
-                "**Get Started:**\n"
-                "• Use `/new-request` to create a marketing kit\n"
-                "• Use `/my-requests` to see your history\n"
-                "• Use `/help` for more commands\n\n"
-                "Let's build something amazing!"
-            ),
-            color=discord.Color.blue()
-        )
-        await member.send(embed=embed)
+        await member.send(embed=_WELCOME_EMBED)
     except:
         pass  # User has DMs disabled
 
@@ -164,41 +436,52 @@ async def on_member_join(member):
 # SLASH COMMANDS
 # ============================================================================
 
+# Static embed, built once and reused for every /help
+_HELP_EMBED = discord.Embed(
+    title="🤖 AgentSpace Commands",
+    description="Generate professional marketing kits using AI",
+    color=discord.Color.blue()
+)
+
+_HELP_EMBED.add_field(
+    name="/new-request",
+    value="Create a new marketing kit request",
+    inline=False
+)
+
+_HELP_EMBED.add_field(
+    name="/my-requests",
+    value="View your request history",
+    inline=False
+)
+
+_HELP_EMBED.add_field(
+    name="/request-status <id>",
+    value="Check status of a specific request",
+    inline=False
+)
+
+_HELP_EMBED.add_field(
+    name="/download <id>",
+    value="Download completed marketing kit",
+    inline=False
+)
+
+_HELP_EMBED.set_footer(text="Need help? Ask in #support")
+
+
+# Static failure embed for /submit-request
+_KIT_FAILED_EMBED = discord.Embed(
+    title="❌ Error",
+    description="Failed to generate marketing kit.",
+    color=discord.Color.red()
+)
+
+
 @bot.tree.command(name="help", description="Show all available commands")
 async def help_command(interaction: discord.Interaction):
     """Help command."""
-    embed = discord.Embed(
-        title="🤖 AgentSpace Commands",
-        description="Generate professional marketing kits using AI",
-        color=discord.Color.blue()
-    )
-    
-    embed.add_field(
-        name="/new-request",
-        value="Create a new marketing kit request",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="/my-requests",
-        value="View your request history",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="/request-status <id>",
-        value="Check status of a specific request",
-        inline=False
-    )
-    
-    embed.add_field(
-        name="/download <id>",
-        value="Download completed marketing kit",
-        inline=False
-    )
-    
-    embed.set_footer(text="Need help? Ask in #support")
-    
+    await interaction.response.send_message(embed=_HELP_EMBED, ephemeral=True)
 
 
 @bot.tree.command(name="new-request", description="Create a new marketing kit request")
@@ -221,72 +504,53 @@ async def new_request(
 ):
     """Create a new marketing kit request."""
     
-    # Register user
-    register_discord_user(str(interaction.user.id), interaction.user.name)
-    
     # Defer response (this can take time)
     await interaction.response.defer(thinking=True)
     
     try:
         # Register user
-        register_discord_user(str(interaction.user.id), interaction.user.name)
+        await _db_write(register_discord_user, str(interaction.user.id), interaction.user.name)
 
         # Create request in database with status 'pending'
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute('''
-                INSERT INTO discord_requests 
-                (discord_id, guild_id, channel_id, request_type, client_name, website, offerings, competitors, additional_info, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending')
-            ''', (
-                str(interaction.user.id),
-                str(interaction.guild_id) if interaction.guild else None,
-                str(interaction.channel_id),
-                request_type,
-                client_name,
-                website,
-                offerings,
-                competitors,
-                additional_info
-            ))
-            request_id = c.lastrowid
-            conn.commit()
+        request_id = await _db_write(
+            _insert_request,
+            str(interaction.user.id),
+            str(interaction.guild_id) if interaction.guild else None,
+            str(interaction.channel_id),
+            request_type,
+            client_name,
+            website,
+            offerings,
+            competitors,
+            additional_info
+        )
     except Exception as e:
         await interaction.followup.send(f"❌ Error creating request: {e}")
         return
 
     # Prompt for attachments
-    embed = discord.Embed(
-        title="📎 Attach Files (Optional)",
-        description=(
+    embed = discord.Embed.from_dict({
+        "title": "📎 Attach Files (Optional)",
+        "description": (
             f"Request ID: #{request_id}\n\n"
             "If you have any files to attach (brand story, logo, etc.), please upload them now in this channel.\n"
             f"When finished, type `/submit-request {request_id}` to continue."
         ),
-        color=discord.Color.orange()
-    )
-    embed.add_field(name="Client", value=client_name, inline=True)
-    embed.add_field(name="Type", value=request_type, inline=True)
-    embed.add_field(name="Status", value="Awaiting attachments...", inline=False)
+        "color": _ORANGE,
+        "fields": [
+            {"name": "Client", "value": client_name, "inline": True},
+            {"name": "Type", "value": request_type, "inline": True},
+            {"name": "Status", "value": "Awaiting attachments...", "inline": False},
+        ],
+    })
     await interaction.followup.send(embed=embed)
 
 @bot.tree.command(name="submit-request", description="Submit your request after uploading attachments")
 @app_commands.describe(request_id="The ID of your pending request")
 async def submit_request(interaction: discord.Interaction, request_id: int):
     """Submit a pending request and generate the marketing kit."""
-    # Update status to 'processing'
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute('''
-        UPDATE discord_requests SET status = 'processing' WHERE id = ? AND discord_id = ?
-    ''', (request_id, str(interaction.user.id)))
-    conn.commit()
-    # Fetch request details
-    c.execute('''
-        SELECT client_name, request_type, website, offerings, competitors, additional_info FROM discord_requests WHERE id = ? AND discord_id = ?
-    ''', (request_id, str(interaction.user.id)))
-    req = c.fetchone()
-    conn.close()
+    # Update status to 'processing' and fetch request details
+    req = await _db_write(_claim_request, request_id, str(interaction.user.id))
     if not req:
         await interaction.response.send_message("❌ Request not found or you don't have permission to submit it.", ephemeral=True)
         return
@@ -305,83 +569,73 @@ async def submit_request(interaction: discord.Interaction, request_id: int):
     )
 
     if result:
-        success_embed = discord.Embed(
-            title="✅ Marketing Kit Generated!",
-            description=f"Request ID: #{request_id}",
-            color=discord.Color.green()
-        )
-        success_embed.add_field(name="Client", value=client_name, inline=True)
-        success_embed.add_field(name="Status", value="✓ Completed", inline=True)
-        success_embed.add_field(
-            name="Download",
-            value=f"Use `/download {request_id}` to get your files!",
-            inline=False
-        )
+        success_embed = discord.Embed.from_dict({
+            "title": "✅ Marketing Kit Generated!",
+            "description": f"Request ID: #{request_id}",
+            "color": _GREEN,
+            "fields": [
+                {"name": "Client", "value": client_name, "inline": True},
+                {"name": "Status", "value": "✓ Completed", "inline": True},
+                {"name": "Download", "value": f"Use `/download {request_id}` to get your files!", "inline": False},
+            ],
+        })
         await interaction.followup.send(embed=success_embed)
     else:
-        error_embed = discord.Embed(
-            title="❌ Error",
-            description="Failed to generate marketing kit.",
-            color=discord.Color.red()
+        await interaction.followup.send(embed=_KIT_FAILED_EMBED)
+
+
+@bot.tree.command(name="my-requests", description="View your request history")
+async def my_requests(interaction: discord.Interaction):
+    """Show the user's ten most recent requests."""
+    requests = await asyncio.to_thread(_list_requests, str(interaction.user.id))
+    if not requests:
+        await interaction.response.send_message(
+            "You haven't made any requests yet. Use `/new-request` to get started!",
+            ephemeral=True
         )
-        await interaction.followup.send(embed=error_embed)
-    
-    # If you need to show request history, open a new connection here
-    # Example:
-    # conn = sqlite3.connect(DB_PATH)
-    # c = conn.cursor()
-    # c.execute('''SELECT * FROM discord_requests WHERE discord_id = ? ORDER BY created_at DESC LIMIT 10''', (str(interaction.user.id),))
-    # requests = c.fetchall()
-    # conn.close()
-    # if not requests:
-    #     await interaction.response.send_message(
-    #         "You haven't made any requests yet. Use `/new-request` to get started!",
-    #         ephemeral=True
-    #     )
-    #     return
-    # embed = discord.Embed(
-    #     title=f"📋 Your Requests ({len(requests)})",
-    #     color=discord.Color.blue()
-    # )
-    # for req in requests:
-    #     ...
+        return
+    embed = discord.Embed(
+        title=f"📋 Your Requests ({len(requests)})",
+        color=discord.Color.blue()
+    )
+    for req in requests:
+        status = req['status']
+        embed.add_field(
+            name=f"#{req['id']} - {req['client_name']}",
+            value=f"{STATUS_EMOJI.get(status, '❓')} {STATUS_TITLE.get(status) or status.title()} | {req['request_type']} | {req['created_at']}",
+            inline=False
+        )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
 
 
 @bot.tree.command(name="download", description="Download a completed marketing kit")
 @app_commands.describe(request_id="The ID of your request")
 async def download(interaction: discord.Interaction, request_id: int):
     """Download a completed marketing kit."""
-    import os
-    import traceback
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute('''
-            SELECT status, docx_output_path, client_name
-            FROM discord_requests
-            WHERE id = ? AND discord_id = ?
-        ''', (request_id, str(interaction.user.id)))
-        result = c.fetchone()
+    result = await asyncio.to_thread(_get_download, request_id, str(interaction.user.id))
     if not result:
-        print(f"[ERROR] Download: No result for request_id={request_id}, user={interaction.user.id}")
+        logger.warning("Download: no result for request_id=%s, user=%s", request_id, interaction.user.id)
         await interaction.response.send_message(
             "❌ Request not found or you don't have permission to access it.",
             ephemeral=True
         )
         return
     status, docx_path, client_name = result
-    print(f"[DOWNLOAD DEBUG] status={status}, docx_path={docx_path}, client_name={client_name}")
-    # Make path absolute if not already
-    if docx_path and not os.path.isabs(docx_path):
-        docx_path = os.path.abspath(docx_path)
-    print(f"[DOWNLOAD DEBUG] Absolute docx_path: {docx_path}")
+    logger.debug("Download: status=%s, docx_path=%s, client_name=%s", status, docx_path, client_name)
     if status != 'completed':
         await interaction.response.send_message(
             f"⏳ Request #{request_id} is still {status}. Please wait for it to complete.",
             ephemeral=True
         )
         return
-    if not docx_path or not os.path.exists(docx_path):
-        print(f"[ERROR] Download: File not found at {docx_path}")
+    # Make path absolute if not already
+    if docx_path and not os.path.isabs(docx_path):
+        docx_path = os.path.abspath(docx_path)
+    # One worker-thread hop reads the file; a missing file surfaces here
+    # instead of through a separate exists() check
+    data = await asyncio.to_thread(_read_file, docx_path) if docx_path else None
+    if data is None:
+        logger.warning("Download: file not found at %s", docx_path)
         await interaction.response.send_message(
             f"❌ File not found. Path: {docx_path}",
             ephemeral=True
@@ -389,7 +643,7 @@ async def download(interaction: discord.Interaction, request_id: int):
         return
     await interaction.response.defer(thinking=True)
     try:
-        file = discord.File(docx_path, filename=f"Marketing_Kit_{client_name.replace(' ', '_')}.docx")
+        file = discord.File(io.BytesIO(data), filename=f"Marketing_Kit_{safe_filename(client_name)}.docx")
         embed = discord.Embed(
             title="📄 Your Marketing Kit",
             description=f"Request ID: #{request_id}\nClient: {client_name}",
@@ -398,7 +652,7 @@ async def download(interaction: discord.Interaction, request_id: int):
         embed.set_footer(text="Generated by AgentSpace")
         await interaction.followup.send(embed=embed, file=file)
     except Exception as e:
-        print(f"[ERROR] Exception sending file: {e}\n{traceback.format_exc()}")
+        logger.exception("Download: error sending file")
         await interaction.followup.send(f"❌ Error sending file: {str(e)}")
 
 
@@ -417,43 +671,60 @@ async def on_message(message):
     # Check for file attachments
     if message.attachments:
         # Check if user has a pending request
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute('''
-                SELECT id FROM discord_requests
-                WHERE discord_id = ? AND status = 'pending'
-                ORDER BY created_at DESC
-                LIMIT 1
-            ''', (str(message.author.id),))
-            pending = c.fetchone()
-            if pending:
-                request_id = pending[0]
-                # Save attachments
-                for attachment in message.attachments:
-                    filename = attachment.filename
-                    filepath = os.path.join(UPLOAD_FOLDER, f"{request_id}_{filename}")
-                    await attachment.save(filepath)
-                    sql = (
-                        """
-                        INSERT INTO discord_files (request_id, filename, filepath, file_type)
-                        VALUES (?, ?, ?, ?)
-                        """
-                    )
-                    c.execute(sql, (request_id, filename, filepath, attachment.content_type))
-                conn.commit()
-                await message.add_reaction('✅')
+        request_id = await asyncio.to_thread(_pending_request_id, str(message.author.id))
+        if request_id is not None:
+            # Save attachments concurrently, then record them in one transaction
+            rows = [
+                (request_id, attachment.filename,
+                 os.path.join(UPLOAD_FOLDER, f"{request_id}_{attachment.filename}"),
+                 attachment.content_type)
+                for attachment in message.attachments
+            ]
+            results = await asyncio.gather(*(
+                attachment.save(row[2]) for attachment, row in zip(message.attachments, rows)
+            ), return_exceptions=True)
+            # One failed download shouldn't drop the files that did arrive
+            saved, failed = [], []
+            for row, result in zip(rows, results):
+                if isinstance(result, BaseException):
+                    logger.warning("Upload: failed to save %s for request_id=%s: %s",
+                                   row[1], request_id, result)
+                    failed.append(row)
+                else:
+                    saved.append(row)
+            if failed:
+                # Don't leave partial downloads behind in UPLOAD_FOLDER
+                await asyncio.to_thread(_remove_files, [row[2] for row in failed])
+            failed_names = ", ".join(row[1] for row in failed)
+            if not saved:
                 await message.reply(
-                    f"✅ Files added to request #{request_id}!\n"
-                    f"Continue with the request or use `/submit-request {request_id}` when ready."
+                    f"❌ Couldn't save your file(s) to request #{request_id}: {failed_names}. "
+                    f"Please try uploading again."
+                )
+                return
+            await _db_write(_save_attachment_rows, saved)
+            if failed:
+                await message.add_reaction('⚠️')
+                await message.reply(
+                    f"⚠️ {len(saved)} of {len(rows)} files saved to request #{request_id}; "
+                    f"failed: {failed_names}. Please upload those again."
                 )
             else:
+                await message.add_reaction('✅')
                 await message.reply(
-                    "💡 Create a request first using `/new-request`, then upload files!"
+                    f"✅ Files added to request #{request_id}!\n"
+                    f"Continue with the request or use `/submit-request {request_id}` when ready."
                 )
-            return
+        else:
+            await message.reply(
+                "💡 Create a request first using `/new-request`, then upload files!"
+            )
+        return
     
-    # Process commands
-    await bot.process_commands(message)
+    # Plain chat (the common case) can't be a prefix command; skip building
+    # a command Context for it
+    if message.content.startswith(bot.command_prefix):
+        await bot.process_commands(message)
 
 
 # ============================================================================
@@ -464,69 +735,29 @@ async def process_discord_request(request_id, client_name, website, offerings, c
     """Process a marketing kit request from Discord."""
     
     # --- NEW LOGIC: Use same enrichment/validation as webapp ---
-    import sqlite3
-    from agentspace_scrapers import analyze_all_sources
-    from agentspace_inputs import prepare_inputs_with_defaults
-    from agentspace_main_AI import run_marketing_kit_generation_AI
-    try:
-        from agentspace_webapp import sanitize_unicode, remove_surrogates_and_log
-    except ImportError:
-        def sanitize_unicode(obj):
-            if isinstance(obj, str):
-                return obj.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-            elif isinstance(obj, dict):
-                return {sanitize_unicode(k): sanitize_unicode(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [sanitize_unicode(i) for i in obj]
-            elif isinstance(obj, tuple):
-                return tuple(sanitize_unicode(i) for i in obj)
-            elif isinstance(obj, set):
-                return {sanitize_unicode(i) for i in obj}
-            elif obj is None or isinstance(obj, (int, float, bool)):
-                return obj
-            else:
-                return sanitize_unicode(str(obj))
-        def remove_surrogates_and_log(obj, log_path=None, path_stack=None):
-            if path_stack is None:
-                path_stack = []
-            if isinstance(obj, str):
-                return ''.join(ch if not (0xD800 <= ord(ch) <= 0xDFFF) else '\uFFFD' for ch in obj)
-            elif isinstance(obj, dict):
-                return {k: remove_surrogates_and_log(v, log_path, path_stack + [k]) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [remove_surrogates_and_log(i, log_path, path_stack + [str(idx)]) for idx, i in enumerate(obj)]
-            elif isinstance(obj, tuple):
-                return tuple(remove_surrogates_and_log(i, log_path, path_stack + [str(idx)]) for idx, i in enumerate(obj))
-            elif isinstance(obj, set):
-                return {remove_surrogates_and_log(i, log_path, path_stack + [str(idx)]) for idx, i in obj}
-            elif obj is None or isinstance(obj, (int, float, bool)):
-                return obj
-            else:
-                return remove_surrogates_and_log(str(obj), log_path, path_stack)
-
     # 1. Gather uploaded files for this request
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute('SELECT filepath FROM discord_files WHERE request_id = ?', (request_id,))
-        uploaded_files = [row[0] for row in c.fetchall()]
+    uploaded_files = await asyncio.to_thread(_request_files, request_id)
 
     # 2. Build form_data dict (like webapp)
     form_data = {"company_name": client_name}
     if website:
         form_data["website"] = website
     if offerings:
-        form_data["products_services"] = [s.strip() for s in offerings.split(',') if s.strip()]
+        form_data["products_services"] = _clean_csv(offerings)
     if competitors:
-        form_data["main_competitors"] = [c.strip() for c in competitors.split(',') if c.strip()]
+        form_data["main_competitors"] = _clean_csv(competitors)
     if additional_info:
         form_data["company_overview"] = additional_info
 
-    # 3. Enrich and validate inputs
-    enriched_profile = analyze_all_sources(
+    # 3. Enrich and validate inputs (scraping and file parsing run on the
+    # kit executor so the gateway loop keeps serving other commands)
+    loop = asyncio.get_running_loop()
+    enriched_profile = await loop.run_in_executor(_kit_executor, functools.partial(
+        analyze_all_sources,
         website_url=website,
         uploaded_files=uploaded_files,
         form_data=form_data
-    )
+    ))
     validated_inputs = prepare_inputs_with_defaults(enriched_profile)
     if 'error' in enriched_profile and not enriched_profile.get('company_overview'):
         # Save error JSON as in webapp
@@ -537,27 +768,12 @@ async def process_discord_request(request_id, client_name, website, offerings, c
             "metadata": {},
             "errors": [enriched_profile['error']]
         }
-        json_filename = f"discord_marketing_kit_{client_name.replace(' ', '_')}_{request_id}.json"
+        json_filename = f"discord_marketing_kit_{safe_filename(client_name)}_{request_id}.json"
         json_path = os.path.join(OUTPUT_FOLDER, json_filename)
-        safe_error_json = sanitize_unicode(error_json)
         log_id = request_id if request_id is not None else 'unknown'
-        error_log_path = os.path.join(OUTPUT_FOLDER, f"error_log_{log_id}.txt")
-        scrubbed_error_json = remove_surrogates_and_log(safe_error_json, log_path=error_log_path)
-        with open(json_path, 'w', encoding='utf-8') as f:
-            f.write(json.dumps(scrubbed_error_json, indent=2, ensure_ascii=True))
+        write_json(json_path, error_json, os.path.join(OUTPUT_FOLDER, f"error_log_{log_id}.txt"))
         # Update DB
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('''
-            UPDATE discord_requests
-            SET status = 'failed',
-                json_output_path = ?,
-                docx_output_path = NULL,
-                completed_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (json_path, request_id))
-        conn.commit()
-        conn.close()
+        await _db_write(_mark_failed, request_id, json_path)
         return False
     if 'error' in enriched_profile and enriched_profile.get('company_overview'):
         enriched_profile.pop('error', None)
@@ -565,36 +781,25 @@ async def process_discord_request(request_id, client_name, website, offerings, c
         validated_inputs.pop('error', None)
 
     # 4. Run agent (same as webapp)
-    result = run_marketing_kit_generation_AI(validated_inputs, output_format="json", provider="claude")
+    result = await loop.run_in_executor(_kit_executor, functools.partial(
+        run_marketing_kit_generation_AI, validated_inputs, output_format="json", provider="claude"
+    ))
     if result and result.success:
-        json_filename = f"discord_marketing_kit_{client_name.replace(' ', '_')}_{request_id}.json"
+        json_filename = f"discord_marketing_kit_{safe_filename(client_name)}_{request_id}.json"
         json_path = os.path.join(OUTPUT_FOLDER, json_filename)
-        safe_result = sanitize_unicode(result.to_dict())
+        result_dict = result.to_dict()
         log_id = request_id if request_id is not None else 'unknown'
-        error_log_path = os.path.join(OUTPUT_FOLDER, f"error_log_{log_id}.txt")
-        scrubbed_result = remove_surrogates_and_log(safe_result, log_path=error_log_path)
-        with open(json_path, 'w', encoding='utf-8') as f:
-            f.write(json.dumps(scrubbed_result, indent=2, ensure_ascii=True))
+        write_json(json_path, result_dict, os.path.join(OUTPUT_FOLDER, f"error_log_{log_id}.txt"))
         # Generate DOCX
-        from agentspace_docx_generator import generate_marketing_kit_docx
-        docx_path = generate_marketing_kit_docx(
+        docx_path = await loop.run_in_executor(_kit_executor, functools.partial(
+            generate_marketing_kit_docx,
             company_name=client_name,
             agent_results=result.output,
             output_dir=OUTPUT_FOLDER
-        )
+        ))
         # Update DB
-        with sqlite3.connect(DB_PATH) as conn:
-            c = conn.cursor()
-            c.execute('''
-                UPDATE discord_requests
-                SET status = 'completed',
-                    json_output_path = ?,
-                    docx_output_path = ?,
-                    completed_at = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (json_path, docx_path, request_id))
-            conn.commit()
-            return True
+        await _db_write(_mark_completed, request_id, json_path, docx_path)
+        return True
     return False
 
 
@@ -603,6 +808,8 @@ async def process_discord_request(request_id, client_name, website, offerings, c
 # ============================================================================
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
     # Initialize database
     init_discord_db()
     
@@ -610,25 +817,35 @@ if __name__ == '__main__':
     DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
     
     if not DISCORD_BOT_TOKEN:
-        print("❌ ERROR: DISCORD_BOT_TOKEN not found in environment variables")
-        print("\nTo set up:")
-        print("1. Go to https://discord.com/developers/applications")
-        print("2. Create a New Application")
-        print("3. Go to Bot section, create a bot")
-        print("4. Copy the token")
-        print("5. Set environment variable: DISCORD_BOT_TOKEN=your_token_here")
-        print("\nOr run: export DISCORD_BOT_TOKEN='your_token_here'")
-        exit(1)
+        sys.stderr.write(
+            "❌ ERROR: DISCORD_BOT_TOKEN not found in environment variables\n"
+            "\nTo set up:\n"
+            "1. Go to https://discord.com/developers/applications\n"
+            "2. Create a New Application\n"
+            "3. Go to Bot section, create a bot\n"
+            "4. Copy the token\n"
+            "5. Set environment variable: DISCORD_BOT_TOKEN=your_token_here\n"
+            "\nOr run: export DISCORD_BOT_TOKEN='your_token_here'\n"
+        )
+        sys.exit(1)
     
-    print("\n" + "="*60)
-    print("AgentSpace Discord Bot")
-    print("="*60)
-    print("\nStarting bot...")
-    print("Commands:")
-    print("  /help - Show all commands")
-    print("  /new-request - Create marketing kit")
-    print("  /my-requests - View history")
-    print("  /download - Get your files")
-    print("\n" + "="*60 + "\n")
+    rule = "=" * 60
+    sys.stdout.write("\n".join([
+        "",
+        rule,
+        "AgentSpace Discord Bot",
+        rule,
+        "",
+        "Starting bot...",
+        "Commands:",
+        "  /help - Show all commands",
+        "  /new-request - Create marketing kit",
+        "  /my-requests - View history",
+        "  /download - Get your files",
+        "",
+        rule,
+        "",
+    ]) + "\n")
+    sys.stdout.flush()
     
     bot.run(DISCORD_BOT_TOKEN)
@@ -15,7 +15,8 @@ Root causes found in the Feb 2 output and fixed here:
            _write_blocks() renders them as bold label + normal value.
 
   BUG 4 — duplicate H1 "Campaign Structure"
-      FIX: _seen_h1 set — second write of the same H1 is silently skipped.
+      FIX: _seen_h1 set — second write of the same H1 is silently skipped
+           (matched ignoring case and whitespace, via _heading_key).
 
   BUG 5 — flat structure (7 H3 vs Swift's 52)
       Sub-headings like "Macro Trends & Growth", "Evergreen Campaigns",
@@ -28,18 +29,31 @@ Root causes found in the Feb 2 output and fixed here:
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
-from datetime import datetime
+from docx.oxml import OxmlElement
+import os
 import re
+import time
+
+from agentspace_files import safe_filename, scrub_surrogates
 
 
 # ============================================================================
 # DEDUPLICATION
 # ============================================================================
+# `.` stops at newlines, so the lazy scan is bounded by line length, not
+# section length. _parse dedups each line once; captured pieces of an
+# already-deduped line are not scanned again.
 _DUPE_RE = re.compile(r'(.{4,}?)\1+')
 
 def _dedup(text: str) -> str:
+    if len(text) < 8:  # shortest possible repeat is 4 chars twice
+        return text
     return _DUPE_RE.sub(r'\1', text)
 
+def _heading_key(text: str) -> str:
+    """Case- and whitespace-insensitive key for spotting repeated headings."""
+    return " ".join(text.split()).casefold()
+
 
 # ============================================================================
 # BLOCK TYPES
@@ -51,18 +65,18 @@ LBL  = "label"
 NORM = "normal"
 
 # ── Known persona / structured-field labels ────────────────────────────────
-_LABEL_WORDS = {
+_LABEL_WORDS = frozenset({
     "Profile", "Motivation", "Needs", "Messaging", "Demographic",
     "Psychographic", "Buying Behavior", "Summary", "Copy", "Hashtags",
     "Design Goal", "Frequency", "Alignment", "Actions", "Key Components",
     "Focus Areas", "Key Metrics", "Purpose", "Design Standards",
     "Copy Structure", "Posting Cadence", "Content Sources", "Design Tips",
     "Copy Guidelines", "Idea Starters", "Cadence and Governance",
-}
+})
 
 # ── Known sub-heading phrases that should always become H3 ─────────────────
 # (exact-match after strip; case-insensitive comparison)
-_SUB_HEADINGS = {
+_SUB_HEADINGS = frozenset({
     "macro trends & growth",
     "competitor landscape & buying behavior",
     "channel opportunities",
@@ -108,21 +122,57 @@ _SUB_HEADINGS = {
     "health assessment landing page",
     "specific condition landing page",
     "comparison landing page",
-}
+})
+# Possible heading lengths; a line of any other length (ignoring trailing
+# colons) is rejected before building its lower-cased copy
+_SUB_HEADING_LENS = frozenset(map(len, _SUB_HEADINGS))
 
 
 # ============================================================================
 # PARSER
 # ============================================================================
-def _parse(raw: str) -> list:
-    if not raw or not raw.strip():
-        return []
-
-    blocks = []
-    chunks = re.split(r'\n\s*\n', raw.strip())
+# Compiled once; _parse tests every line against most of these, and the
+# normal-text loop re-tests each following line as a stop condition
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n')
+_HASH_HEAD_RE  = re.compile(r'#{1,4}\s+(.+)')
+_BOLD_HEAD_RE  = re.compile(r'\*\*(.+?)\*\*:?\s*$')
+_FINDING_RE    = re.compile(r'\*?\*?(\d{1,2})\s*[|]\s*(.+?)\*?\*?\s*$')
+_BULLET_RE     = re.compile(r'[•\-]\s+(.*)')
+_NUMBERED_RE   = re.compile(r'\d+\.\s+(.*)')
+_LABEL_RE      = re.compile(r'\*{0,2}([A-Za-z &\'&()]+?):\*{0,2}\s+(.*)')
+_PERSONA_RE    = re.compile(r'(The [A-Z][^:]{4,40}):\s*(.*)')
+# Any line steps 1-5 and 7 would claim, as one pattern for the normal-text
+# collector's stop check (the first three must span the whole line)
+_STOP_RE = re.compile(
+    r'(?:#{1,4}\s+.+'
+    r'|\*\*.+?\*\*:?\s*'
+    r'|\*?\*?\d{1,2}\s*[|]\s*.+?\*?\*?\s*)\Z'
+    r'|[•\-]\s'
+    r'|\d+\.\s'
+    r'|The [A-Z][^:]{4,40}:'
+)
+
+def _parse(raw: str):
+    """Yield (type, text) / (LBL, label, text) block tuples for `raw` in document order."""
+    if not raw:
+        return
+    raw = raw.strip()
+    if not raw:
+        return
+
+    # A blank-line separator needs at least two newlines; single-paragraph
+    # outputs skip the regex split entirely
+    chunks = _PARA_SPLIT_RE.split(raw) if raw.count('\n') > 1 else (raw,)
 
     for chunk in chunks:
         lines = chunk.split('\n')
+        # Index of the chunk's last non-blank line: "is there a non-blank
+        # line after i?" becomes i < last_nonblank, O(1) instead of a scan
+        last_nonblank = -1
+        for j in range(len(lines) - 1, -1, -1):
+            if lines[j].strip():
+                last_nonblank = j
+                break
         i = 0
         while i < len(lines):
             line = _dedup(lines[i]).strip()
@@ -130,85 +180,82 @@ def _parse(raw: str) -> list:
                 i += 1
                 continue
 
+            # Steps 1-7 only try the patterns whose first character can
+            # match, so plain prose skips straight to step 8
+            c0 = line[0]
+
             # ── 1. # or ## heading ──────────────────────────────────
-            m = re.fullmatch(r'#{1,4}\s+(.+)', line)
+            m = c0 == '#' and _HASH_HEAD_RE.fullmatch(line)
             if m:
-                blocks.append({"type": H3, "text": m.group(1).strip()})
+                yield (H3, m.group(1).strip())
                 i += 1
                 continue
 
             # ── 2. **Heading** alone on a line ──────────────────────
-            m = re.fullmatch(r'\*\*(.+?)\*\*:?\s*$', line)
+            m = c0 == '*' and _BOLD_HEAD_RE.fullmatch(line)
             if m:
-                blocks.append({"type": H3, "text": m.group(1).strip()})
+                yield (H3, m.group(1).strip())
                 i += 1
                 continue
 
             # ── 3. 0X | Finding Title ───────────────────────────────
-            m = re.fullmatch(r'\*?\*?(\d{1,2})\s*[|]\s*(.+?)\*?\*?\s*$', line)
+            m = (c0 == '*' or c0.isdecimal()) and _FINDING_RE.fullmatch(line)
             if m:
-                blocks.append({"type": H3,
-                               "text": f"{m.group(1).zfill(2)} | {m.group(2).strip()}"})
+                yield (H3, f"{m.group(1).zfill(2)} | {m.group(2).strip()}")
                 i += 1
                 continue
 
             # ── 4. bullet  •  or  -  ────────────────────────────────
-            m = re.match(r'[•\-]\s+(.*)', line)
+            m = c0 in '•-' and _BULLET_RE.match(line)
             if m:
-                blocks.append({"type": BULL, "text": _dedup(m.group(1)).strip()})
+                yield (BULL, m.group(1).strip())
                 i += 1
                 continue
 
             # ── 5. numbered  1.  ────────────────────────────────────
-            m = re.match(r'\d+\.\s+(.*)', line)
+            m = c0.isdecimal() and _NUMBERED_RE.match(line)
             if m:
-                blocks.append({"type": NUM, "text": _dedup(m.group(1)).strip()})
+                yield (NUM, m.group(1).strip())
                 i += 1
                 continue
 
             # ── 6. Label: value  ────────────────────────────────────
-            m = re.match(r'\*{0,2}([A-Za-z &\'&()]+?):\*{0,2}\s+(.*)', line)
+            m = (c0 == '*' or c0.isalpha()) and _LABEL_RE.match(line)
             if m and m.group(1).strip() in _LABEL_WORDS:
-                blocks.append({"type": LBL,
-                               "label": m.group(1).strip(),
-                               "text":  _dedup(m.group(2)).strip()})
+                yield (LBL, m.group(1).strip(), m.group(2).strip())
                 i += 1
                 continue
 
             # ── 7. "The Persona Name:" line ─────────────────────────
-            m = re.match(r'(The [A-Z][^:]{4,40}):\s*(.*)', line)
+            m = c0 == 'T' and _PERSONA_RE.match(line)
             if m:
-                blocks.append({"type": H3, "text": m.group(1).strip()})
-                remainder = _dedup(m.group(2)).strip()
+                yield (H3, m.group(1).strip())
+                remainder = m.group(2).strip()
                 if remainder:
-                    blocks.append({"type": NORM, "text": remainder})
+                    yield (NORM, remainder)
                 i += 1
                 continue
 
             # ── 8. Known sub-heading (whitelist) ────────────────────
-            if line.lower().rstrip(':') in _SUB_HEADINGS:
-                blocks.append({"type": H3, "text": line.rstrip(':')})
+            if (len(line.rstrip(':')) in _SUB_HEADING_LENS and
+                line.lower().rstrip(':') in _SUB_HEADINGS):
+                yield (H3, line.rstrip(':'))
                 i += 1
                 continue
 
             # ── 9. Short standalone line heuristic ──────────────────
             # 2-7 words, starts with capital, no trailing period or colon,
-            # not a checkbox line, not starting with a digit, and there IS
-            # a following non-blank line (so it's not a dangling fragment).
-            words_here = line.split()
-            if (2 <= len(words_here) <= 7 and
-                not line.endswith('.') and
-                not line.endswith(':') and
-                words_here[0][0].isupper() and
-                not line.startswith('✅') and
-                not line.startswith('❌') and
-                not re.match(r'\d', line) and
-                not line.startswith('"') and
-                not line.startswith("'")):
+            # and there IS a following non-blank line (so it's not a
+            # dangling fragment). The capital check comes first: it is one
+            # C call, and digits, quotes and ✅/❌ are never upper-case, so
+            # it also rules out checkbox and numbered lines. split(None, 7)
+            # stops after 8 pieces, so long prose lines are not fully split.
+            if (c0.isupper() and
+                not line.endswith(('.', ':')) and
+                2 <= len(line.split(None, 7)) <= 7):
                 # peek forward for a following line
-                has_next = any(lines[j].strip() for j in range(i+1, len(lines)))
-                if has_next:
-                    blocks.append({"type": H3, "text": line})
+                if i < last_nonblank:
+                    yield (H3, line)
                     i += 1
                     continue
 
@@ -219,73 +266,83 @@ def _parse(raw: str) -> list:
                 nxt = lines[i].strip()
                 if not nxt:
                     break
-                # stop at any special-pattern line
-                if (re.fullmatch(r'#{1,4}\s+.+', nxt) or
-                    re.fullmatch(r'\*\*(.+?)\*\*:?\s*$', nxt) or
-                    re.fullmatch(r'\*?\*?\d{1,2}\s*[|]\s*.+?\*?\*?\s*$', nxt) or
-                    re.match(r'[•\-]\s', nxt) or
-                    re.match(r'\d+\.\s', nxt) or
-                    re.match(r'The [A-Z][^:]{4,40}:', nxt) or
+                # stop at any special-pattern line (one regex, and only
+                # for lines whose first character could start one)
+                n0 = nxt[0]
+                if ((n0 in '#*•-T' or n0.isdecimal()) and _STOP_RE.match(nxt) or
+                    len(nxt.rstrip(':')) in _SUB_HEADING_LENS and
                     nxt.lower().rstrip(':') in _SUB_HEADINGS):
                     break
                 # also stop if next line would hit the short-line heuristic
-                nxt_words = nxt.split()
-                if (2 <= len(nxt_words) <= 7 and
-                    not nxt.endswith('.') and not nxt.endswith(':') and
-                    nxt_words[0][0].isupper() and
-                    not nxt.startswith('✅') and not nxt.startswith('❌') and
-                    not re.match(r'\d', nxt) and
-                    not nxt.startswith('"') and not nxt.startswith("'")):
+                if (n0.isupper() and
+                    not nxt.endswith(('.', ':')) and
+                    2 <= len(nxt.split(None, 7)) <= 7):
                     # check if there's a line after *that*
-                    if any(lines[j].strip() for j in range(i+1, len(lines))):
+                    if i < last_nonblank:
                         break
                 collected.append(_dedup(nxt))
                 i += 1
-            blocks.append({"type": NORM, "text": " ".join(collected)})
-
-    return blocks
+            yield (NORM, " ".join(collected))
 
 
 # ============================================================================
 # BLOCK WRITER
 # ============================================================================
-def _write_blocks(doc: Document, blocks: list):
-    # Remove consecutive duplicate H3s (artifact of LLM repeating sub-headings)
-    cleaned = []
+# **bold** spans inside normal text
+_BOLD_SPLIT_RE = re.compile(r'\*\*(.+?)\*\*')
+
+def _write_blocks(doc: Document, blocks):
+    """Write blocks (any iterable, e.g. straight from _parse) to `doc`."""
+    # Plain and list paragraphs go in as raw <w:p> XML just before the body's
+    # sectPr (looked up once per section; each body-level find is a scan)
+    sect_pr = doc.element.body.sectPr
+    # Resolved once per section; a style name is looked up on every add
+    bullet_style = doc.styles["List Bullet"]
+    number_style = doc.styles["List Number"]
+    list_style_ids = {BULL: bullet_style.style_id, NUM: number_style.style_id}
     prev_h3 = None
     for b in blocks:
-        if b["type"] == "h3":
-            if b["text"] == prev_h3:
-                continue
-            prev_h3 = b["text"]
-        else:
-            prev_h3 = None
-        cleaned.append(b)
-    blocks = cleaned
-    for b in blocks:
-        t = b["type"]
+        t = b[0]
 
         if t == H3:
-            doc.add_heading(b["text"], level=3)
-
-        elif t == BULL:
-            doc.add_paragraph(b["text"], style="List Bullet")
-
-        elif t == NUM:
-            doc.add_paragraph(b["text"], style="List Number")
+            # Skip consecutive duplicate H3s (artifact of LLM repeating sub-headings)
+            key = _heading_key(b[1])
+            if key == prev_h3:
+                continue
+            prev_h3 = key
+            doc.add_heading(b[1], level=3)
+            continue
+        prev_h3 = None
+
+        if t == BULL or t == NUM:
+            if sect_pr is None:
+                doc.add_paragraph(b[1], style=bullet_style if t == BULL else number_style)
+            else:
+                # Same raw <w:p> path as plain text, plus the list pStyle
+                p = OxmlElement('w:p')
+                sect_pr.addprevious(p)
+                p.style = list_style_ids[t]
+                p.add_r().text = b[1]
 
         elif t == LBL:
+            _, label, text = b
             p = doc.add_paragraph()
-            run_l = p.add_run(f"{b['label']}:")
+            run_l = p.add_run(f"{label}:")
             run_l.bold = True
-            if b.get("text"):
-                p.add_run(f"  {b['text']}")
+            if text:
+                p.add_run(f"  {text}")
 
         else:   # NORM
-            raw = b["text"]
-            parts = re.split(r'\*\*(.+?)\*\*', raw)
-            if len(parts) == 1:
-                doc.add_paragraph(raw)
+            raw = b[1]
+            # Most paragraphs have no '**' at all; skip the regex for them
+            parts = _BOLD_SPLIT_RE.split(raw) if '**' in raw else None
+            if parts is None or len(parts) == 1:
+                if sect_pr is None:
+                    doc.add_paragraph(raw)
+                else:
+                    p = OxmlElement('w:p')
+                    sect_pr.addprevious(p)
+                    p.add_r().text = raw
             else:
                 p = doc.add_paragraph()
                 for idx, part in enumerate(parts):
@@ -299,6 +356,26 @@ def _write_blocks(doc: Document, blocks: list):
 # ============================================================================
 # GENERATOR CLASS
 # ============================================================================
+# Numbered once at import; the TOC is static text
+_TOC_LINES = tuple(f"{i}. {title}" for i, title in enumerate((
+    "Overview", "The Goal", "Key Findings", "Market Landscape",
+    "Audience & Personas", "Brand Voice", "Content Strategy",
+    "Social Strategy", "Campaign Structure", "Engagement Framework",
+), 1))
+
+# (agent key, H1 title) in document order
+_SECTIONS = (
+    ("overview_writer",              "Overview"),
+    ("key_findings_researcher",      "Key Findings"),
+    ("market_landscape_analyzer",    "Market Landscape"),
+    ("persona_creator",              "Audience & Personas"),
+    ("brand_voice_definer",          "Brand Voice"),
+    ("keyword_strategist",           "Keyword Strategy"),
+    ("social_strategist",            "Social Strategy"),
+    ("campaign_architect",           "Campaign Structure"),
+    ("engagement_framework_builder", "Engagement Framework"),
+)
+
 class MarketingKitDocxGenerator:
     def __init__(self, design_system=None):
         self.doc = Document()
@@ -334,9 +411,10 @@ class MarketingKitDocxGenerator:
             run.font.color.rgb = RGBColor(*self.design_system.colors.primary)
 
     def _add_h1(self, text: str):
-        if text in self._seen_h1:
+        key = _heading_key(text)
+        if key in self._seen_h1:
             return
-        self._seen_h1.add(text)
+        self._seen_h1.add(key)
         heading = self.doc.add_heading(text, level=1)
         run = heading.runs[0]
         run.font.size  = Pt(18)
@@ -352,9 +430,12 @@ class MarketingKitDocxGenerator:
         return p
 
     def _write_section(self, content: str):
-        _write_blocks(self.doc, _parse(str(content)))
+        # Lone surrogates can't be serialized into the DOCX XML
+        _write_blocks(self.doc, _parse(scrub_surrogates(content)))
 
-    def generate(self, company_name: str, agent_results: dict, save_path: str):
+    def generate(self, company_name: str, agent_results: dict, save_path: str, now=None):
+        # `now` (a time.struct_time) lets callers stamp the title page and
+        # the filename with the same moment
         # title page
         self._add_title("Marketing Kit")
         self.doc.add_paragraph()
@@ -362,7 +443,7 @@ class MarketingKitDocxGenerator:
         tp.alignment = WD_ALIGN_PARAGRAPH.CENTER
         tp.runs[0].font.size = Pt(16)
         self.doc.add_paragraph()
-        dp = self.doc.add_paragraph(datetime.now().strftime("%B %Y"))
+        dp = self.doc.add_paragraph(time.strftime("%B %Y", now or time.localtime()))
         dp.alignment = WD_ALIGN_PARAGRAPH.CENTER
         dp.runs[0].font.size = Pt(12)
         dp.runs[0].italic    = True
@@ -370,32 +451,22 @@ class MarketingKitDocxGenerator:
 
         # TOC
         self._add_h1("Table of Contents")
-        for i, title in enumerate([
-            "Overview", "The Goal", "Key Findings", "Market Landscape",
-            "Audience & Personas", "Brand Voice", "Content Strategy",
-            "Social Strategy", "Campaign Structure", "Engagement Framework"
-        ], 1):
-            self._add_paragraph(f"{i}. {title}")
+        # Static lines: no dedup scan, no run restyling
+        add_paragraph = self.doc.add_paragraph
+        for line in _TOC_LINES:
+            add_paragraph(line)
         self.doc.add_page_break()
 
         # sections
-        SECTIONS = [
-            ("overview_writer",              "Overview"),
-            ("key_findings_researcher",      "Key Findings"),
-            ("market_landscape_analyzer",    "Market Landscape"),
-            ("persona_creator",              "Audience & Personas"),
-            ("brand_voice_definer",          "Brand Voice"),
-            ("keyword_strategist",           "Keyword Strategy"),
-            ("social_strategist",            "Social Strategy"),
-            ("campaign_architect",           "Campaign Structure"),
-            ("engagement_framework_builder", "Engagement Framework"),
-        ]
-
-        for agent_key, section_title in SECTIONS:
-            if agent_key not in agent_results:
+        for agent_key, section_title in _SECTIONS:
+            result = agent_results.get(agent_key)
+            output = result.get("output") if result else None
+            if not output:
                 continue
-            output = agent_results[agent_key].get("output", "")
-            if not output or not str(output).strip():
+            if not isinstance(output, str):
+                output = str(output)
+            # isspace() answers "blank?" without building a stripped copy
+            if output.isspace():
                 continue
             self._add_h1(section_title)
             self._write_section(output)
@@ -410,9 +481,10 @@ class MarketingKitDocxGenerator:
 # ============================================================================
 def generate_marketing_kit_docx(company_name: str, agent_results: dict,
                                 output_dir: str = ".", design_system=None):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename  = f"Marketing_Kit_{company_name.replace(' ', '_')}_{timestamp}.docx"
-    save_path = f"{output_dir}/{filename}"
+    now       = time.localtime()
+    timestamp = time.strftime("%Y%m%d_%H%M%S", now)
+    filename  = f"Marketing_Kit_{safe_filename(company_name)}_{timestamp}.docx"
+    save_path = os.path.join(output_dir, filename)
     generator = MarketingKitDocxGenerator(design_system=design_system)
-    generator.generate(company_name, agent_results, save_path)
+    generator.generate(company_name, agent_results, save_path, now=now)
     return save_path
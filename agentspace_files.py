@@ -0,0 +1,99 @@
+"""
+AgentSpace - Output File Helpers
+
+Shared by the web app, the Discord bot, the CLI generators and the DOCX
+generator, so every output file is named and written the same way.
+"""
+
+import json
+import re
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# ============================================================================
+# FILENAMES
+# ============================================================================
+
+# Spaces, path separators and ':' (reserved on Windows) in client names
+# -> underscores in filenames
+_FNAME_TRANS = str.maketrans({' ': '_', '/': '_', '\\': '_', ':': '_'})
+
+
+def safe_filename(name: str) -> str:
+    """Make a client/company name safe to embed in an output filename."""
+    return name.translate(_FNAME_TRANS)
+
+
+# ============================================================================
+# SURROGATES
+# ============================================================================
+
+# Lone UTF-16 surrogates, which can't be encoded as UTF-8 or written into
+# DOCX XML. The one pattern every writer scrubs with.
+SURROGATE_RE = re.compile('[\ud800-\udfff]')
+
+
+def scrub_surrogates(text: str) -> str:
+    """Replace lone surrogates in `text` with U+FFFD."""
+    return SURROGATE_RE.sub('\ufffd', text)
+
+
+# ============================================================================
+# JSON OUTPUT
+# ============================================================================
+
+# Stdlib fallback encoder; iterencode yields the document in small chunks
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=str)
+
+
+def _dumps_fast(data):
+    """
+    Encode data with orjson, or return None if orjson is missing or the
+    data contains lone surrogates (which orjson rejects) - the caller then
+    falls back to the streaming stdlib path.
+    """
+    if not ORJSON_AVAILABLE:
+        return None
+    try:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return None
+
+
+def write_json(path, data, log_path=None):
+    """
+    Write data as indented UTF-8 JSON. orjson output goes out in one write;
+    otherwise the stdlib encoder streams chunks to the file, swapping lone
+    surrogates for U+FFFD per chunk (a chunk never splits a string, and
+    valid astral characters are single code points, so only real strays
+    match). Replacements and serialization errors are noted in `log_path`.
+    """
+    try:
+        payload = _dumps_fast(data)
+        if payload is not None:
+            with open(path, 'wb', buffering=1 << 20) as f:
+                f.write(payload)
+            return
+        replaced = 0
+        with open(path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            for chunk in _JSON_ENCODER.iterencode(data):
+                chunk, count = SURROGATE_RE.subn('\ufffd', chunk)
+                replaced += count
+                f.write(chunk)
+        if replaced and log_path:
+            with open(log_path, 'a', encoding='utf-8') as log:
+                log.write(f"Replaced {replaced} lone surrogate(s) while writing JSON\n")
+    except Exception as e:
+        if log_path:
+            try:
+                with open(log_path, 'a', encoding='utf-8', errors='replace') as log:
+                    log.write(f"Serialization error: {str(e)}\n\nData:\n{data}\n")
+                print(f"Serialization error logged to {log_path}")
+            except Exception as log_e:
+                print(f"Failed to write error log: {log_e}")
+        raise
@@ -4,9 +4,116 @@ Marketing Kit Input Schema - FIXED for Intelligent System
 This version makes most fields optional so scraped data can fill them.
 """
 
+from collections import deque
+from types import MappingProxyType
+
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
+from agentspace_files import SURROGATE_RE, scrub_surrogates
+
+
+def _sanitize_str(text: str) -> str:
+    # ASCII text cannot hold a surrogate; skip the encode round-trip
+    if text.isascii():
+        return text
+    return text.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
+
+
+def _sanitize_leaf(obj):
+    if isinstance(obj, str):
+        return _sanitize_str(obj)
+    elif isinstance(obj, tuple):
+        return tuple(sanitize_unicode(i) for i in obj)
+    elif isinstance(obj, set):
+        return {sanitize_unicode(i) for i in obj}
+    elif obj is None or isinstance(obj, (int, float, bool)):
+        return obj
+    else:
+        # For any other type, convert to string and sanitize
+        return _sanitize_str(str(obj))
+
+
+def sanitize_unicode(obj):
+    """
+    Replace lone surrogates in every string of a JSON-like structure.
+
+    Dicts and lists are cleaned in place by walking an explicit stack (no
+    Python call per node), and the same object is returned.
+    """
+    if not isinstance(obj, (dict, list)):
+        return _sanitize_leaf(obj)
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            # Keys can't be replaced in place; rebuild (in order) only if
+            # one of them actually changes
+            if not all(type(k) is str and k.isascii() for k in node):
+                items = [(_sanitize_leaf(k), v) for k, v in node.items()]
+                node.clear()
+                node.update(items)
+            entries = node.items()
+        else:
+            entries = enumerate(node)
+        for key, value in entries:
+            if isinstance(value, str):
+                if not value.isascii():
+                    node[key] = _sanitize_str(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+            elif value is None or isinstance(value, (int, float, bool)):
+                continue
+            else:
+                node[key] = _sanitize_leaf(value)
+    return obj
+
+
+def _scrub_str(text, log_path, path):
+    # If surrogates present, log and replace
+    if log_path:
+        with open(log_path, 'a', encoding='utf-8', errors='replace') as log:
+            log.write(f"Surrogate found at {'.'.join(map(str, path))}: {repr(text)}\n")
+    return scrub_surrogates(text)
+
+
+def _scrub_leaf(obj, log_path, path):
+    if isinstance(obj, str):
+        return obj if SURROGATE_RE.search(obj) is None else _scrub_str(obj, log_path, path)
+    elif isinstance(obj, tuple):
+        return tuple(remove_surrogates_and_log(i, log_path, path + [str(idx)]) for idx, i in enumerate(obj))
+    elif isinstance(obj, set):
+        return {remove_surrogates_and_log(i, log_path, path + [str(idx)]) for idx, i in enumerate(obj)}
+    elif obj is None or isinstance(obj, (int, float, bool)):
+        return obj
+    else:
+        # For any other type, convert to string and sanitize
+        return _scrub_leaf(str(obj), log_path, path)
+
+
+def remove_surrogates_and_log(obj, log_path=None, path_stack=None):
+    """Replace lone surrogates throughout `obj`, noting each hit's path in `log_path`."""
+    # Dicts and lists (nearly all of a JSON payload) are scrubbed in place
+    # by walking an explicit stack, so there is no Python call per node.
+    # Paths are only materialised for containers and for surrogate hits.
+    path = list(path_stack or [])
+    if not isinstance(obj, (dict, list)):
+        return _scrub_leaf(obj, log_path, path)
+    stack = deque([(obj, path)])
+    while stack:
+        node, path = stack.pop()
+        for key, value in (node.items() if isinstance(node, dict) else enumerate(node)):
+            if isinstance(value, str):
+                if SURROGATE_RE.search(value) is not None:
+                    node[key] = _scrub_str(value, log_path, path + [key])
+            elif isinstance(value, (dict, list)):
+                stack.append((value, path + [key]))
+            elif value is None or isinstance(value, (int, float, bool)):
+                continue
+            else:
+                node[key] = _scrub_leaf(value, log_path, path + [key])
+    return obj
+
 
 class BrandQuestionnaire(BaseModel):
     """
@@ -102,24 +209,6 @@ def get_example_inputs() -> dict:
     """
     Example inputs - now with more optional fields.
     """
-    try:
-        from agentspace_webapp import sanitize_unicode
-    except ImportError:
-        def sanitize_unicode(obj):
-            if isinstance(obj, str):
-                return obj.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-            elif isinstance(obj, dict):
-                return {sanitize_unicode(k): sanitize_unicode(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [sanitize_unicode(i) for i in obj]
-            elif isinstance(obj, tuple):
-                return tuple(sanitize_unicode(i) for i in obj)
-            elif isinstance(obj, set):
-                return {sanitize_unicode(i) for i in obj}
-            elif obj is None or isinstance(obj, (int, float, bool)):
-                return obj
-            else:
-                return sanitize_unicode(str(obj))
     example = {
         "company_name": "Example Corp",
         "industry": "Technology Services",
@@ -141,57 +230,48 @@ def get_example_inputs() -> dict:
     return sanitize_unicode(example)
 
 
+# Defaults for every field the questionnaire needs. Read-only and built
+# once at import; list fields are stored as tuples and copied per request.
+_AGENT_INPUT_DEFAULTS = MappingProxyType({
+    "industry": "To be determined",
+    "company_size": "To be determined",
+    "company_overview": "",
+    "mission_statement": "To be defined",
+    "core_values": ("Quality", "Innovation", "Customer Focus"),
+    "unique_selling_proposition": "To be defined",
+    "target_audience_description": "To be defined",
+    "customer_pain_points": ("To be researched",),
+    "customer_goals": ("To be researched",),
+    "main_competitors": (),
+    "competitive_advantages": ("To be defined",),
+    "market_position": "To be defined",
+    "brand_personality_adjectives": ("Professional", "Reliable", "Innovative"),
+    "tone_preferences": "Professional and approachable",
+    "products_services": ("To be defined",),
+    "business_model": "B2B",
+    "key_features": (),
+    "primary_business_goal": "Growth and market leadership",
+    "target_markets": ("To be researched",),
+    "growth_stage": "Growth",
+    "proof_points": (),
+    "primary_channels": ("Website", "Social Media"),
+})
+
+
 # Helper function to ensure all required fields have defaults
 def prepare_inputs_with_defaults(inputs: dict) -> dict:
     """
-    Take any dict of inputs and fill in missing required fields with defaults.
-    This ensures validation always passes.
+    Fill in missing required fields with defaults so validation always passes.
+
+    Works in place: `inputs` is updated and returned, so callers keep a
+    single reference to the profile instead of holding a merged copy.
     """
-    defaults = {
-        # Provide sensible defaults for everything
-        "industry": "To be determined",
-        "company_size": "To be determined",
-        "company_overview": "",
-        "mission_statement": "To be defined",
-        "core_values": ["Quality", "Innovation", "Customer Focus"],
-        "unique_selling_proposition": "To be defined",
-        "target_audience_description": "To be defined",
-        "customer_pain_points": ["To be researched"],
-        "customer_goals": ["To be researched"],
-        "main_competitors": [],
-        "competitive_advantages": ["To be defined"],
-        "market_position": "To be defined",
-        "brand_personality_adjectives": ["Professional", "Reliable", "Innovative"],
-        "tone_preferences": "Professional and approachable",
-        "products_services": ["To be defined"],
-        "business_model": "B2B",
-        "key_features": [],
-        "primary_business_goal": "Growth and market leadership",
-        "target_markets": ["To be researched"],
-        "growth_stage": "Growth",
-        "proof_points": [],
-        "primary_channels": ["Website", "Social Media"],
-    }
-    try:
-        from agentspace_webapp import sanitize_unicode
-    except ImportError:
-        def sanitize_unicode(obj):
-            if isinstance(obj, str):
-                return obj.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-            elif isinstance(obj, dict):
-                return {sanitize_unicode(k): sanitize_unicode(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [sanitize_unicode(i) for i in obj]
-            elif isinstance(obj, tuple):
-                return tuple(sanitize_unicode(i) for i in obj)
-            elif isinstance(obj, set):
-                return {sanitize_unicode(i) for i in obj}
-            elif obj is None or isinstance(obj, (int, float, bool)):
-                return obj
-            else:
-                return sanitize_unicode(str(obj))
-    result = {**defaults, **inputs}
-    return sanitize_unicode(result)
+    for key, value in _AGENT_INPUT_DEFAULTS.items():
+        if key not in inputs:
+            inputs[key] = list(value) if isinstance(value, tuple) else value
+    for key, value in inputs.items():
+        inputs[key] = sanitize_unicode(value)
+    return inputs
 
 
 if __name__ == "__main__":
@@ -14,6 +14,8 @@ Based on analysis of Swift Innovation's writing style.
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Dict, Tuple, Optional
 import re
 
@@ -67,7 +69,7 @@ SWIFT_LANGUAGE_PROFILE = {
 # LANGUAGE STYLE SYSTEM
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class LanguageStyle:
     """
     Complete language/writing style specification.
@@ -86,16 +88,16 @@ class LanguageStyle:
     # VOICE & TONE
     active_voice_target: float        # % active voice (vs passive)
     declarative_ratio: float          # % statements vs questions
-    tone_adjectives: List[str]        # Confident, Professional, Bold, etc.
+    tone_adjectives: Tuple[str, ...]  # Confident, Professional, Bold, etc.
     
     # VOCABULARY
-    power_words: List[str]            # Key vocabulary to emphasize
-    avoid_words: List[str]            # Words to avoid (jargon, clichés)
+    power_words: Tuple[str, ...]      # Key vocabulary to emphasize
+    avoid_words: Tuple[str, ...]      # Words to avoid (jargon, clichés)
     vocabulary_level: str             # "accessible", "professional", "technical"
     
     # SIGNATURE PATTERNS
-    signature_phrases: List[str]      # Distinctive patterns (e.g., "X sells Y")
-    sentence_starters: List[str]      # Preferred opening words
+    signature_phrases: Tuple[str, ...] # Distinctive patterns (e.g., "X sells Y")
+    sentence_starters: Tuple[str, ...] # Preferred opening words
     emphasis_pattern: str             # How to create emphasis
     
     # PACING & RHYTHM
@@ -113,7 +115,7 @@ class LanguageStyle:
 # PRE-BUILT LANGUAGE STYLES
 # ============================================================================
 
-LANGUAGE_STYLES = {
+_LANGUAGE_STYLES = {
     "swift_innovation": LanguageStyle(
         name="Swift Innovation Voice",
         description="Clear, declarative statements with strategic power words. Active voice. Punchy rhythm.",
@@ -126,22 +128,22 @@ LANGUAGE_STYLES = {
         # Voice (97% active)
         active_voice_target=0.95,
         declarative_ratio=0.90,         # Statements, not questions
-        tone_adjectives=["Confident", "Precise", "Strategic", "Modern"],
+        tone_adjectives=("Confident", "Precise", "Strategic", "Modern"),
         
         # Vocabulary
-        power_words=["momentum", "clarity", "fragmentation", "embedded", "aligned",
-                    "execution", "outcomes", "strategic", "connected", "infrastructure"],
-        avoid_words=["utilize", "leverage", "synergy", "paradigm", "solution"],
+        power_words=("momentum", "clarity", "fragmentation", "embedded", "aligned",
+                    "execution", "outcomes", "strategic", "connected", "infrastructure"),
+        avoid_words=("utilize", "leverage", "synergy", "paradigm", "solution"),
         vocabulary_level="professional",
         
         # Patterns
-        signature_phrases=[
+        signature_phrases=(
             "X sells 'Y'",
             "without [noun]",
             "Not X. Y.",
             "[Noun] without [modifier]"
-        ],
-        sentence_starters=["Swift", "Most", "Businesses", "Strategy", "Execution"],
+        ),
+        sentence_starters=("Swift", "Most", "Businesses", "Strategy", "Execution"),
         emphasis_pattern="contrast",    # A not B. C.
         
         # Pacing
@@ -165,19 +167,19 @@ LANGUAGE_STYLES = {
         
         active_voice_target=0.80,
         declarative_ratio=0.85,
-        tone_adjectives=["Professional", "Authoritative", "Thorough", "Trustworthy"],
+        tone_adjectives=("Professional", "Authoritative", "Thorough", "Trustworthy"),
         
-        power_words=["excellence", "integrity", "commitment", "innovation", "expertise",
-                    "performance", "quality", "value", "partnership", "solutions"],
-        avoid_words=["gonna", "wanna", "cool", "awesome", "game-changer"],
+        power_words=("excellence", "integrity", "commitment", "innovation", "expertise",
+                    "performance", "quality", "value", "partnership", "solutions"),
+        avoid_words=("gonna", "wanna", "cool", "awesome", "game-changer"),
         vocabulary_level="professional",
         
-        signature_phrases=[
+        signature_phrases=(
             "We are committed to",
             "Our expertise in",
             "Through our comprehensive"
-        ],
-        sentence_starters=["Our", "We", "The company", "Through", "With"],
+        ),
+        sentence_starters=("Our", "We", "The company", "Through", "With"),
         emphasis_pattern="elaboration",
         
         rhythm="flowing",
@@ -199,19 +201,19 @@ LANGUAGE_STYLES = {
         
         active_voice_target=0.95,
         declarative_ratio=0.85,
-        tone_adjectives=["Direct", "Modern", "Efficient", "Bold"],
+        tone_adjectives=("Direct", "Modern", "Efficient", "Bold"),
         
-        power_words=["transform", "innovate", "scale", "automate", "accelerate",
-                    "optimize", "disrupt", "platform", "ecosystem", "intelligence"],
-        avoid_words=["traditional", "legacy", "manual", "slow", "complex"],
+        power_words=("transform", "innovate", "scale", "automate", "accelerate",
+                    "optimize", "disrupt", "platform", "ecosystem", "intelligence"),
+        avoid_words=("traditional", "legacy", "manual", "slow", "complex"),
         vocabulary_level="professional",
         
-        signature_phrases=[
+        signature_phrases=(
             "Built for",
             "Ship faster",
             "Zero [pain point]"
-        ],
-        sentence_starters=["Build", "Ship", "Scale", "Transform", "Automate"],
+        ),
+        sentence_starters=("Build", "Ship", "Scale", "Transform", "Automate"),
         emphasis_pattern="repetition",
         
         rhythm="punchy",
@@ -233,19 +235,19 @@ LANGUAGE_STYLES = {
         
         active_voice_target=0.90,
         declarative_ratio=0.75,         # More variety
-        tone_adjectives=["Bold", "Creative", "Energetic", "Distinctive"],
+        tone_adjectives=("Bold", "Creative", "Energetic", "Distinctive"),
         
-        power_words=["unleash", "ignite", "breakthrough", "revolutionary", "vibrant",
-                    "bold", "fearless", "transform", "elevate", "spectacular"],
-        avoid_words=["boring", "standard", "typical", "average", "normal"],
+        power_words=("unleash", "ignite", "breakthrough", "revolutionary", "vibrant",
+                    "bold", "fearless", "transform", "elevate", "spectacular"),
+        avoid_words=("boring", "standard", "typical", "average", "normal"),
         vocabulary_level="accessible",
         
-        signature_phrases=[
+        signature_phrases=(
             "Imagine [scenario]",
             "What if [question]",
             "Here's the thing:"
-        ],
-        sentence_starters=["Imagine", "Picture", "Think", "Here's", "What if"],
+        ),
+        sentence_starters=("Imagine", "Picture", "Think", "Here's", "What if"),
         emphasis_pattern="surprise",
         
         rhythm="varied",
@@ -267,19 +269,19 @@ LANGUAGE_STYLES = {
         
         active_voice_target=0.85,
         declarative_ratio=0.80,
-        tone_adjectives=["Insightful", "Analytical", "Credible", "Measured"],
+        tone_adjectives=("Insightful", "Analytical", "Credible", "Measured"),
         
-        power_words=["insight", "analysis", "strategic", "framework", "methodology",
-                    "optimize", "benchmark", "assessment", "roadmap", "metrics"],
-        avoid_words=["maybe", "probably", "hope", "try", "wish"],
+        power_words=("insight", "analysis", "strategic", "framework", "methodology",
+                    "optimize", "benchmark", "assessment", "roadmap", "metrics"),
+        avoid_words=("maybe", "probably", "hope", "try", "wish"),
         vocabulary_level="professional",
         
-        signature_phrases=[
+        signature_phrases=(
             "Our analysis shows",
             "Based on research",
             "The data indicates"
-        ],
-        sentence_starters=["Research", "Analysis", "Data", "Studies", "Evidence"],
+        ),
+        sentence_starters=("Research", "Analysis", "Data", "Studies", "Evidence"),
         emphasis_pattern="evidence",
         
         rhythm="methodical",
@@ -301,19 +303,19 @@ LANGUAGE_STYLES = {
         
         active_voice_target=0.95,
         declarative_ratio=0.70,         # More questions for engagement
-        tone_adjectives=["Friendly", "Clear", "Approachable", "Helpful"],
+        tone_adjectives=("Friendly", "Clear", "Approachable", "Helpful"),
         
-        power_words=["simple", "easy", "clear", "helpful", "quick",
-                    "straightforward", "practical", "everyday", "real", "useful"],
-        avoid_words=["utilize", "facilitate", "implement", "paradigm", "synergize"],
+        power_words=("simple", "easy", "clear", "helpful", "quick",
+                    "straightforward", "practical", "everyday", "real", "useful"),
+        avoid_words=("utilize", "facilitate", "implement", "paradigm", "synergize"),
         vocabulary_level="accessible",
         
-        signature_phrases=[
+        signature_phrases=(
             "Here's how",
             "Think of it like",
             "In simple terms"
-        ],
-        sentence_starters=["Let's", "Here's", "Think", "Imagine", "Simply put"],
+        ),
+        sentence_starters=("Let's", "Here's", "Think", "Imagine", "Simply put"),
         emphasis_pattern="clarity",
         
         rhythm="conversational",
@@ -326,11 +328,17 @@ LANGUAGE_STYLES = {
     )
 }
 
+# Read-only view: styles are shared by every request
+LANGUAGE_STYLES = MappingProxyType(_LANGUAGE_STYLES)
+
 
 # ============================================================================
 # LANGUAGE STYLE PROMPTS
 # ============================================================================
 
+# Styles are frozen (hashable by value) and there are only a handful, so
+# each one's instructions are rendered once and reused
+@lru_cache(maxsize=16)
 def get_language_style_instructions(style: LanguageStyle) -> str:
     """
     Generate writing instructions based on language style.
@@ -380,56 +388,57 @@ CRITICAL: Write in THIS style consistently throughout all sections.
     return instructions
 
 
-def get_language_style_examples(style_name: str = "swift_innovation") -> List[str]:
-    """Get example sentences in a given language style."""
+# Example sentences per style; read-only, built once at import
+_STYLE_EXAMPLES = MappingProxyType({
+    "swift_innovation": (
+        "Most businesses piece together agencies, consultants, and disconnected tools.",
+        "Swift was designed to remove fragmentation.",
+        "Strategy without delivery stalls growth.",
+        "We measure outcomes, not hours.",
+        "Momentum without micromanagement."
+    ),
     
-    examples = {
-        "swift_innovation": [
-            "Most businesses piece together agencies, consultants, and disconnected tools.",
-            "Swift was designed to remove fragmentation.",
-            "Strategy without delivery stalls growth.",
-            "We measure outcomes, not hours.",
-            "Momentum without micromanagement."
-        ],
-        
-        "professional_corporate": [
-            "Our organization is committed to delivering exceptional value to our clients.",
-            "Through comprehensive analysis and strategic planning, we enable sustainable growth.",
-            "We bring together deep industry expertise with innovative solutions.",
-            "Our approach is grounded in proven methodologies and best practices."
-        ],
-        
-        "tech_modern": [
-            "Ship faster. Scale infinitely.",
-            "Built for teams that move fast.",
-            "Zero complexity. Maximum impact.",
-            "Transform your workflow in minutes.",
-            "Automate everything. Focus on what matters."
-        ],
-        
-        "creative_bold": [
-            "Imagine a world where creativity flows effortlessly.",
-            "What if your brand could speak without saying a word?",
-            "Here's the thing: Bold ideas need fearless execution.",
-            "We don't just think outside the box. We reimagine it entirely."
-        ],
-        
-        "consultative_expert": [
-            "Our analysis of market trends indicates three key opportunities.",
-            "Research shows that integrated approaches deliver 40% better outcomes.",
-            "Based on benchmark data across 500 companies, we recommend a phased approach.",
-            "The strategic framework combines proven methodologies with emerging best practices."
-        ],
-        
-        "accessible_friendly": [
-            "Here's how it works in simple terms.",
-            "Think of it like building with blocks - one piece at a time.",
-            "We make it easy so you can focus on growing your business.",
-            "Let's break this down into simple steps you can start today."
-        ]
-    }
+    "professional_corporate": (
+        "Our organization is committed to delivering exceptional value to our clients.",
+        "Through comprehensive analysis and strategic planning, we enable sustainable growth.",
+        "We bring together deep industry expertise with innovative solutions.",
+        "Our approach is grounded in proven methodologies and best practices."
+    ),
+    
+    "tech_modern": (
+        "Ship faster. Scale infinitely.",
+        "Built for teams that move fast.",
+        "Zero complexity. Maximum impact.",
+        "Transform your workflow in minutes.",
+        "Automate everything. Focus on what matters."
+    ),
+    
+    "creative_bold": (
+        "Imagine a world where creativity flows effortlessly.",
+        "What if your brand could speak without saying a word?",
+        "Here's the thing: Bold ideas need fearless execution.",
+        "We don't just think outside the box. We reimagine it entirely."
+    ),
+    
+    "consultative_expert": (
+        "Our analysis of market trends indicates three key opportunities.",
+        "Research shows that integrated approaches deliver 40% better outcomes.",
+        "Based on benchmark data across 500 companies, we recommend a phased approach.",
+        "The strategic framework combines proven methodologies with emerging best practices."
+    ),
     
-    return examples.get(style_name, examples["swift_innovation"])
+    "accessible_friendly": (
+        "Here's how it works in simple terms.",
+        "Think of it like building with blocks - one piece at a time.",
+        "We make it easy so you can focus on growing your business.",
+        "Let's break this down into simple steps you can start today."
+    )
+})
+
+
+def get_language_style_examples(style_name: str = "swift_innovation") -> Tuple[str, ...]:
+    """Get example sentences in a given language style."""
+    return _STYLE_EXAMPLES.get(style_name, _STYLE_EXAMPLES["swift_innovation"])
 
 
 # ============================================================================
@@ -446,6 +455,12 @@ def list_language_styles() -> List[str]:
     return list(LANGUAGE_STYLES.keys())
 
 
+# Compiled once for analyze_text_style (only the passive match count is
+# used, so the auxiliary-verb group need not capture)
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+_PASSIVE_RE = re.compile(r'\b(?:is|are|was|were|been)\s+\w+ed\b')
+
+
 def analyze_text_style(text: str) -> Dict[str, any]:
     """
     Analyze a text sample to determine its language style.
@@ -457,25 +472,31 @@ def analyze_text_style(text: str) -> Dict[str, any]:
         Dictionary with style metrics
     """
     
-    # Split into sentences
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s.strip() for s in sentences if len(s.split()) > 2]
+    # Split into sentences and measure them in one pass; fragments of two
+    # words or fewer don't count as sentences
+    total_words = sentence_count = short_count = 0
+    for sentence in _SENT_SPLIT_RE.split(text):
+        n = len(sentence.split())
+        if n > 2:
+            sentence_count += 1
+            total_words += n
+            if n < 10:
+                short_count += 1
     
     # Calculate metrics
-    word_counts = [len(s.split()) for s in sentences]
-    avg_length = sum(word_counts) / len(word_counts) if word_counts else 0
-    short_pct = len([w for w in word_counts if w < 10]) / len(word_counts) if word_counts else 0
+    avg_length = total_words / sentence_count if sentence_count else 0
+    short_pct = short_count / sentence_count if sentence_count else 0
     
-    # Check for passive voice
-    passive_count = len(re.findall(r'\b(is|are|was|were|been)\s+\w+ed\b', text))
-    passive_pct = passive_count / len(sentences) if sentences else 0
+    # Check for passive voice (count matches without building a list)
+    passive_count = sum(1 for _ in _PASSIVE_RE.finditer(text))
+    passive_pct = passive_count / sentence_count if sentence_count else 0
     
     return {
         "avg_sentence_length": avg_length,
         "short_sentence_ratio": short_pct,
         "passive_ratio": passive_pct,
-        "total_sentences": len(sentences),
-        "total_words": sum(word_counts)
+        "total_sentences": sentence_count,
+        "total_words": total_words
     }
 
 
@@ -14,8 +14,11 @@ Each connector provides:
 - Streaming support
 """
 
+import asyncio
 import os
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 import json
 
@@ -30,7 +33,7 @@ except ImportError:
 
 # Claude (Anthropic)
 try:
-    from anthropic import Anthropic
+    from anthropic import Anthropic, AsyncAnthropic
     CLAUDE_AVAILABLE = True
 except ImportError:
     CLAUDE_AVAILABLE = False
@@ -38,12 +41,63 @@ except ImportError:
 
 # GPT (OpenAI)
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI, OpenAI
     GPT_AVAILABLE = True
 except ImportError:
     GPT_AVAILABLE = False
     print("⚠️  openai not installed. Install: pip install openai")
 
+# Exact GPT token counts (optional; falls back to the 4-chars estimate)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+# ============================================================================
+# SHARED SDK CLIENTS
+# ============================================================================
+# SDK clients own an HTTP connection pool and are safe to share between
+# threads, so every LLM instance with the same key reuses one client (and
+# its warm TLS connections) instead of building its own. Usage stats stay
+# per LLM instance. Async clients are not shared: their connections belong
+# to the event loop that opened them, so each LLM instance keeps one per
+# running loop (see BaseLLM._async_client).
+
+# Both SDKs retry rate limits (429), overloads/5xx, timeouts and connection
+# errors with exponential backoff and honour Retry-After; other errors
+# (bad request, auth) fail at once. Raised from the SDK default of 2 so
+# a rate-limit flap doesn't fail a whole kit section.
+_MAX_RETRIES = 5
+
+
+@lru_cache(maxsize=8)
+def _anthropic_client(api_key: str):
+    return Anthropic(api_key=api_key, max_retries=_MAX_RETRIES)
+
+
+@lru_cache(maxsize=8)
+def _openai_client(api_key: str):
+    return OpenAI(api_key=api_key, max_retries=_MAX_RETRIES)
+
+
+def _per_token(per_million: Dict[str, tuple]) -> MappingProxyType:
+    """(input, output) prices per million tokens -> per single token."""
+    return MappingProxyType({
+        model: (price_in / 1_000_000, price_out / 1_000_000)
+        for model, (price_in, price_out) in per_million.items()
+    })
+
+
+def _empty_result(reason: Optional[str]) -> Dict[str, Any]:
+    """Failure dict for a response that carried no text."""
+    return {
+        "content": None,
+        "error": f"Empty response (stop reason: {reason})",
+        "success": False
+    }
+
 
 # ============================================================================
 # BASE LLM CLASS
@@ -52,37 +106,131 @@ except ImportError:
 class BaseLLM:
     """Base class for all LLM providers."""
     
+    # Fixed attribute sets (subclasses add theirs): no per-instance __dict__
+    __slots__ = ("api_key", "pricing", "_requests", "_tokens", "_cost",
+                 "_aclient", "_aclient_loop", "_abatches", "_abatch_opened")
+    
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
-        self.usage_stats = {
-            "total_requests": 0,
-            "total_tokens": 0,
-            "total_cost": 0.0
-        }
+        self._aclient = None
+        self._aclient_loop = None
+        # agenerate_many calls in flight, and whether the first of them
+        # found no client open (then the last one out closes it)
+        self._abatches = 0
+        self._abatch_opened = False
+        # Per-token (input, output) price; subclasses set their model's rate
+        self.pricing = (0.0, 0.0)
+        # Usage counters; get_stats() reports them as a dict
+        self._requests = 0
+        self._tokens = 0
+        self._cost = 0.0
     
     def generate(self, prompt: str, **kwargs) -> Dict[str, Any]:
         """Generate content from prompt. Override in subclass."""
         raise NotImplementedError
     
+    def generate_stream(self, prompt: str, **kwargs) -> Iterator[str]:
+        """
+        Yield the response text as it arrives; usage stats are updated once
+        the stream ends. API errors are raised, not returned. Default yields
+        generate()'s whole result as one chunk.
+        """
+        result = self.generate(prompt, **kwargs)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        yield result["content"]
+    
+    async def agenerate(self, prompt: str, **kwargs) -> Dict[str, Any]:
+        """Async generate(). Default runs the blocking call in a worker thread."""
+        return await asyncio.to_thread(self.generate, prompt, **kwargs)
+    
+    async def agenerate_many(self, prompts: List[str], concurrency: int = 10, **kwargs) -> List[Dict[str, Any]]:
+        """
+        agenerate() every prompt concurrently, at most `concurrency` requests
+        in flight. Results come back in prompt order; kwargs go to each call.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        
+        async def one(prompt):
+            async with sem:
+                return await self.agenerate(prompt, **kwargs)
+        
+        # Overlapping batches share the client; it's closed when the last
+        # one finishes, and only if the batches opened it
+        if self._abatches == 0:
+            self._abatch_opened = self._aclient_loop is not asyncio.get_running_loop()
+        self._abatches += 1
+        try:
+            return await asyncio.gather(*(one(prompt) for prompt in prompts))
+        finally:
+            self._abatches -= 1
+            if self._abatches == 0 and self._abatch_opened:
+                await self.aclose()
+    
+    def _async_client(self, factory):
+        """
+        Async SDK client for the running event loop. Its connection pool is
+        bound to the loop that opened it, so a new client is made whenever
+        the loop changes (e.g. a second asyncio.run).
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            self._aclient = factory(api_key=self.api_key, max_retries=_MAX_RETRIES)
+            self._aclient_loop = loop
+        return self._aclient
+    
+    async def aclose(self):
+        """Close the async client, if one is open on the running loop."""
+        client = self._aclient
+        if client is None:
+            return
+        owned_here = self._aclient_loop is asyncio.get_running_loop()
+        self._aclient = self._aclient_loop = None
+        # A client from an already-closed loop can't be closed from here
+        if owned_here:
+            await client.close()
+    
     def count_tokens(self, text: str) -> int:
         """Rough token count (4 chars = 1 token)."""
         return len(text) // 4
     
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Token counts for several texts. Override when the provider can batch."""
+        return [self.count_tokens(text) for text in texts]
+    
     def update_stats(self, tokens: int, cost: float):
         """Update usage statistics."""
-        self.usage_stats["total_requests"] += 1
-        self.usage_stats["total_tokens"] += tokens
-        self.usage_stats["total_cost"] += cost
+        self._requests += 1
+        self._tokens += tokens
+        self._cost += cost
+    
+    def _record_usage(self, input_tokens: int, output_tokens: int) -> float:
+        """Price one request and add it to the usage stats; returns the cost."""
+        price_in, price_out = self.pricing
+        cost = input_tokens * price_in + output_tokens * price_out
+        self.update_stats(input_tokens + output_tokens, cost)
+        return cost
     
     def get_stats(self) -> Dict:
         """Get usage statistics."""
-        return self.usage_stats.copy()
+        return {
+            "total_requests": self._requests,
+            "total_tokens": self._tokens,
+            "total_cost": self._cost
+        }
 
 
 # ============================================================================
 # CLAUDE (ANTHROPIC)
 # ============================================================================
 
+# Pricing (input, output per million tokens), stored per token
+_CLAUDE_PRICING = _per_token({
+    "claude-sonnet-4-20250514": (3.0, 15.0),
+    "claude-opus-4-20241129": (15.0, 75.0),
+    "claude-haiku-4-20250114": (0.8, 4.0),
+})
+
 class ClaudeLLM(BaseLLM):
     """
     Claude connector via Anthropic API.
@@ -93,6 +241,8 @@ class ClaudeLLM(BaseLLM):
     - claude-haiku-4-20250114 (fastest, cheapest)
     """
     
+    __slots__ = ("model", "client")
+    
     def __init__(self, api_key: Optional[str] = None, model: str = "claude-sonnet-4-20250514"):
         super().__init__(api_key)
         
@@ -105,14 +255,10 @@ class ClaudeLLM(BaseLLM):
         if not CLAUDE_AVAILABLE:
             raise ImportError("anthropic library not installed")
         
-        self.client = Anthropic(api_key=self.api_key)
+        self.client = _anthropic_client(self.api_key)
         
-        # Pricing (per million tokens)
-        self.pricing = {
-            "claude-sonnet-4-20250514": {"input": 3.0, "output": 15.0},
-            "claude-opus-4-20241129": {"input": 15.0, "output": 75.0},
-            "claude-haiku-4-20250114": {"input": 0.8, "output": 4.0},
-        }
+        # Per-token (input, output) price, looked up once per instance
+        self.pricing = _CLAUDE_PRICING.get(model, _CLAUDE_PRICING["claude-sonnet-4-20250514"])
     
     def generate(
         self,
@@ -141,44 +287,45 @@ class ClaudeLLM(BaseLLM):
         """
         
         try:
-            # Build messages
-            messages = [{"role": "user", "content": prompt}]
-            
-            # Call Claude
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                system=system if system else None,
-                messages=messages
-            )
-            
-            # Extract content
-            content = response.content[0].text
-            
-            # Calculate usage
-            input_tokens = response.usage.input_tokens
-            output_tokens = response.usage.output_tokens
-            
-            # Calculate cost
-            pricing = self.pricing.get(self.model, {"input": 3.0, "output": 15.0})
-            cost = (input_tokens / 1_000_000 * pricing["input"]) + \
-                   (output_tokens / 1_000_000 * pricing["output"])
-            
-            # Update stats
-            self.update_stats(input_tokens + output_tokens, cost)
-            
+            response = self.client.messages.create(**self._request(prompt, max_tokens, temperature, system))
+            return self._result(response)
+        
+        except Exception as e:
             return {
-                "content": content,
-                "model": self.model,
-                "tokens": {
-                    "input": input_tokens,
-                    "output": output_tokens,
-                    "total": input_tokens + output_tokens
-                },
-                "cost": cost,
-                "success": True
+                "content": None,
+                "error": str(e),
+                "success": False
             }
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """Yield Claude's text as it streams; same arguments as generate()."""
+        
+        with self.client.messages.stream(**self._request(prompt, max_tokens, temperature, system)) as stream:
+            yield from stream.text_stream
+            usage = stream.get_final_message().usage
+        self._record_usage(usage.input_tokens, usage.output_tokens)
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Async generate(); same arguments and result dict."""
+        
+        try:
+            aclient = self._async_client(AsyncAnthropic)
+            response = await aclient.messages.create(**self._request(prompt, max_tokens, temperature, system))
+            return self._result(response)
         
         except Exception as e:
             return {
@@ -186,12 +333,56 @@ class ClaudeLLM(BaseLLM):
                 "error": str(e),
                 "success": False
             }
+    
+    def _request(self, prompt: str, max_tokens: int, temperature: float,
+                 system: Optional[str]) -> Dict[str, Any]:
+        """messages.create arguments, shared by generate and agenerate."""
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system if system else None,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+    
+    def _result(self, response) -> Dict[str, Any]:
+        """Record usage for a messages.create response and build the result dict."""
+        # Calculate usage (tokens are billed even if no text came back)
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "input_tokens", 0) or 0
+        output_tokens = getattr(usage, "output_tokens", 0) or 0
+        cost = self._record_usage(input_tokens, output_tokens)
+        
+        # Extract content: text blocks only (skips tool_use etc.)
+        content = "".join(block.text for block in response.content
+                          if getattr(block, "type", None) == "text")
+        if not content:
+            return _empty_result(getattr(response, "stop_reason", None))
+        
+        return {
+            "content": content,
+            "model": self.model,
+            "tokens": {
+                "input": input_tokens,
+                "output": output_tokens,
+                "total": input_tokens + output_tokens
+            },
+            "cost": cost,
+            "success": True
+        }
 
 
 # ============================================================================
 # GPT (OPENAI)
 # ============================================================================
 
+# Pricing (input, output per million tokens), stored per token
+_GPT_PRICING = _per_token({
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-3.5-turbo": (0.5, 1.5),
+})
+
 class GPTLLM(BaseLLM):
     """
     GPT connector via OpenAI API.
@@ -202,6 +393,8 @@ class GPTLLM(BaseLLM):
     - gpt-3.5-turbo (cheapest)
     """
     
+    __slots__ = ("model", "client", "_encoding")
+    
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o"):
         super().__init__(api_key)
         
@@ -214,14 +407,35 @@ class GPTLLM(BaseLLM):
         if not GPT_AVAILABLE:
             raise ImportError("openai library not installed")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = _openai_client(self.api_key)
+        self._encoding = None
         
-        # Pricing (per million tokens)
-        self.pricing = {
-            "gpt-4o": {"input": 2.5, "output": 10.0},
-            "gpt-4-turbo": {"input": 10.0, "output": 30.0},
-            "gpt-3.5-turbo": {"input": 0.5, "output": 1.5},
-        }
+        # Per-token (input, output) price, looked up once per instance
+        self.pricing = _GPT_PRICING.get(model, _GPT_PRICING["gpt-4o"])
+    
+    def _get_encoding(self):
+        """The model's tiktoken encoding, loaded on first use (None without tiktoken)."""
+        if self._encoding is None and TIKTOKEN_AVAILABLE:
+            try:
+                self._encoding = tiktoken.encoding_for_model(self.model)
+            except KeyError:
+                # Model name tiktoken doesn't know yet
+                self._encoding = tiktoken.get_encoding("o200k_base")
+        return self._encoding
+    
+    def count_tokens(self, text: str) -> int:
+        """Exact token count via tiktoken, or the base estimate without it."""
+        encoding = self._get_encoding()
+        if encoding is None:
+            return super().count_tokens(text)
+        return len(encoding.encode(text))
+    
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Token counts for several texts, encoded in one tiktoken batch."""
+        encoding = self._get_encoding()
+        if encoding is None:
+            return super().count_tokens_batch(texts)
+        return [len(tokens) for tokens in encoding.encode_batch(texts)]
     
     def generate(
         self,
@@ -238,46 +452,55 @@ class GPTLLM(BaseLLM):
         """
         
         try:
-            # Build messages
-            messages = []
-            if system:
-                messages.append({"role": "system", "content": system})
-            messages.append({"role": "user", "content": prompt})
-            
-            # Call GPT
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            
-            # Extract content
-            content = response.choices[0].message.content
-            
-            # Calculate usage
-            input_tokens = response.usage.prompt_tokens
-            output_tokens = response.usage.completion_tokens
-            
-            # Calculate cost
-            pricing = self.pricing.get(self.model, {"input": 2.5, "output": 10.0})
-            cost = (input_tokens / 1_000_000 * pricing["input"]) + \
-                   (output_tokens / 1_000_000 * pricing["output"])
-            
-            # Update stats
-            self.update_stats(input_tokens + output_tokens, cost)
-            
+            response = self.client.chat.completions.create(**self._request(prompt, max_tokens, temperature, system))
+            return self._result(response)
+        
+        except Exception as e:
             return {
-                "content": content,
-                "model": self.model,
-                "tokens": {
-                    "input": input_tokens,
-                    "output": output_tokens,
-                    "total": input_tokens + output_tokens
-                },
-                "cost": cost,
-                "success": True
+                "content": None,
+                "error": str(e),
+                "success": False
             }
+    
+    def generate_stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[str]:
+        """Yield GPT's text as it streams; same arguments as generate()."""
+        
+        usage = None
+        stream = self.client.chat.completions.create(
+            **self._request(prompt, max_tokens, temperature, system),
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+            # Only the final chunk (with no choices) carries usage
+            if chunk.usage is not None:
+                usage = chunk.usage
+        if usage is not None:
+            self._record_usage(usage.prompt_tokens, usage.completion_tokens)
+    
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 4000,
+        temperature: float = 0.7,
+        system: Optional[str] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Async generate(); same arguments and result dict."""
+        
+        try:
+            aclient = self._async_client(AsyncOpenAI)
+            response = await aclient.chat.completions.create(**self._request(prompt, max_tokens, temperature, system))
+            return self._result(response)
         
         except Exception as e:
             return {
@@ -285,6 +508,47 @@ class GPTLLM(BaseLLM):
                 "error": str(e),
                 "success": False
             }
+    
+    def _request(self, prompt: str, max_tokens: int, temperature: float,
+                 system: Optional[str]) -> Dict[str, Any]:
+        """chat.completions.create arguments, shared by generate and agenerate."""
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+    
+    def _result(self, response) -> Dict[str, Any]:
+        """Record usage for a chat.completions.create response and build the result dict."""
+        # Calculate usage (tokens are billed even if no text came back)
+        usage = getattr(response, "usage", None)
+        input_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        output_tokens = getattr(usage, "completion_tokens", 0) or 0
+        cost = self._record_usage(input_tokens, output_tokens)
+        
+        # Extract content (None for refusals / tool calls, no choices at all
+        # for some filtered responses)
+        choice = response.choices[0] if response.choices else None
+        content = choice.message.content if choice is not None else None
+        if not content:
+            return _empty_result(getattr(choice, "finish_reason", None))
+        
+        return {
+            "content": content,
+            "model": self.model,
+            "tokens": {
+                "input": input_tokens,
+                "output": output_tokens,
+                "total": input_tokens + output_tokens
+            },
+            "cost": cost,
+            "success": True
+        }
 
 
 # ============================================================================
@@ -13,6 +13,8 @@ import re
 from pathlib import Path
 import json
 
+from agentspace_inputs import sanitize_unicode
+
 # PDF reading
 try:
     import pdfplumber
@@ -44,25 +46,6 @@ except ImportError:
 # ============================================================================
 
 def scrape_website(url: str) -> dict:
-    # Import sanitizer from webapp (or redefine here if needed)
-    try:
-        from agentspace_webapp import sanitize_unicode
-    except ImportError:
-        def sanitize_unicode(obj):
-            if isinstance(obj, str):
-                return obj.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-            elif isinstance(obj, dict):
-                return {sanitize_unicode(k): sanitize_unicode(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [sanitize_unicode(i) for i in obj]
-            elif isinstance(obj, tuple):
-                return tuple(sanitize_unicode(i) for i in obj)
-            elif isinstance(obj, set):
-                return {sanitize_unicode(i) for i in obj}
-            elif obj is None or isinstance(obj, (int, float, bool)):
-                return obj
-            else:
-                return sanitize_unicode(str(obj))
     """
     Scrape a website and extract key business information.
     
@@ -1,49 +1,3 @@
-# Final surrogate scrubber and logger
-import sys
-def remove_surrogates_and_log(obj, log_path=None, path_stack=None):
-    if path_stack is None:
-        path_stack = []
-    if isinstance(obj, str):
-        # If surrogates present, log and replace
-        if any(0xD800 <= ord(ch) <= 0xDFFF for ch in obj):
-            if log_path:
-                with open(log_path, 'a', encoding='utf-8', errors='replace') as log:
-                    log.write(f"Surrogate found at {'.'.join(map(str, path_stack))}: {repr(obj)}\n")
-            # Replace surrogates with replacement char
-            return ''.join(ch if not (0xD800 <= ord(ch) <= 0xDFFF) else '\uFFFD' for ch in obj)
-        return obj
-    elif isinstance(obj, dict):
-        return {k: remove_surrogates_and_log(v, log_path, path_stack + [k]) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [remove_surrogates_and_log(i, log_path, path_stack + [str(idx)]) for idx, i in enumerate(obj)]
-    elif isinstance(obj, tuple):
-        return tuple(remove_surrogates_and_log(i, log_path, path_stack + [str(idx)]) for idx, i in enumerate(obj))
-    elif isinstance(obj, set):
-        return {remove_surrogates_and_log(i, log_path, path_stack + [str(idx)]) for idx, i in enumerate(obj)}
-    elif obj is None or isinstance(obj, (int, float, bool)):
-        return obj
-    else:
-        # For any other type, convert to string and sanitize
-        return remove_surrogates_and_log(str(obj), log_path, path_stack)
-
-# Function to remove all surrogate code points from strings, recursively for any JSON-serializable structure
-def sanitize_unicode(obj):
-    if isinstance(obj, str):
-        # Encode/decode with errors='replace' to remove/replace invalid surrogates
-        return obj.encode('utf-8', errors='replace').decode('utf-8', errors='replace')
-    elif isinstance(obj, dict):
-        return {sanitize_unicode(k): sanitize_unicode(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [sanitize_unicode(i) for i in obj]
-    elif isinstance(obj, tuple):
-        return tuple(sanitize_unicode(i) for i in obj)
-    elif isinstance(obj, set):
-        return {sanitize_unicode(i) for i in obj}
-    elif obj is None or isinstance(obj, (int, float, bool)):
-        return obj
-    else:
-        # For any other type, convert to string and sanitize
-        return sanitize_unicode(str(obj))
 """
 AgentSpace Web Application
 
@@ -60,16 +14,22 @@ from flask_login import LoginManager, UserMixin, login_user, logout_user, login_
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
 import os
-import json
 from datetime import datetime
 from pathlib import Path
 import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 
 # Import your agent
 
 from agentspace_main_AI import run_marketing_kit_generation_AI
 from agentspace_docx_generator import generate_marketing_kit_docx
+from agentspace_files import safe_filename, write_json
 from agentspace_scrapers import analyze_all_sources
+from agentspace_inputs import prepare_inputs_with_defaults
+from agentspace_design_agent import get_design_for_company
+from agentspace_design_styles import get_design_system, create_custom_design_system
+from agentspace_language_styles import get_language_style, get_language_style_instructions
+from agentspace_db import SQLitePool, WriteBatcher
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
@@ -86,6 +46,12 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = 'login'
 
+# Shared connection pool (opened on first use): page and login reads use
+# the read-only connections, status updates the writer
+_db_pool = SQLitePool('agentspace.db', readers=4)
+# Folds concurrent request-status updates into one commit
+_db_batcher = WriteBatcher(_db_pool)
+
 
 # ============================================================================
 # DATABASE SETUP
@@ -159,11 +125,10 @@ class User(UserMixin):
 
 @login_manager.user_loader
 def load_user(user_id):
-    conn = sqlite3.connect('agentspace.db')
-    c = conn.cursor()
-    c.execute('SELECT id, username, email, is_admin FROM users WHERE id = ?', (user_id,))
-    user_data = c.fetchone()
-    conn.close()
+    with _db_pool.reader() as conn:
+        user_data = conn.execute(
+            'SELECT id, username, email, is_admin FROM users WHERE id = ?', (user_id,)
+        ).fetchone()
     
     if user_data:
         return User(user_data[0], user_data[1], user_data[2], user_data[3])
@@ -192,11 +157,10 @@ def login():
         username = request.form['username']
         password = request.form['password']
         
-        conn = sqlite3.connect('agentspace.db')
-        c = conn.cursor()
-        c.execute('SELECT id, username, email, password_hash, is_admin FROM users WHERE username = ?', (username,))
-        user_data = c.fetchone()
-        conn.close()
+        with _db_pool.reader() as conn:
+            user_data = conn.execute(
+                'SELECT id, username, email, password_hash, is_admin FROM users WHERE username = ?', (username,)
+            ).fetchone()
         
         if user_data and check_password_hash(user_data[3], password):
             user = User(user_data[0], user_data[1], user_data[2], user_data[4])
@@ -259,17 +223,14 @@ def logout():
 @login_required
 def dashboard():
     """User dashboard showing request history."""
-    conn = sqlite3.connect('agentspace.db')
-    c = conn.cursor()
-    c.execute('''
-        SELECT id, request_type, client_name, status, created_at, completed_at
-        FROM requests
-        WHERE user_id = ?
-        ORDER BY created_at DESC
-        LIMIT 20
-    ''', (current_user.id,))
-    requests = c.fetchall()
-    conn.close()
+    with _db_pool.reader() as conn:
+        requests = conn.execute('''
+            SELECT id, request_type, client_name, status, created_at, completed_at
+            FROM requests
+            WHERE user_id = ?
+            ORDER BY created_at DESC
+            LIMIT 20
+        ''', (current_user.id,)).fetchall()
     
     return render_template('dashboard.html', requests=requests, user=current_user)
 
@@ -344,11 +305,10 @@ def new_request():
         except Exception as e:
             flash(f'Error generating marketing kit: {str(e)}', 'error')
             # Update status to failed
-            conn = sqlite3.connect('agentspace.db')
-            c = conn.cursor()
-            c.execute('UPDATE requests SET status = ? WHERE id = ?', ('failed', request_id))
-            conn.commit()
-            conn.close()
+            with _db_pool.writer() as conn:
+                conn.execute('BEGIN IMMEDIATE')
+                conn.execute('UPDATE requests SET status = ? WHERE id = ?', ('failed', request_id))
+                conn.execute('COMMIT')
     
     return render_template('new_request.html')
 
@@ -357,33 +317,26 @@ def new_request():
 @login_required
 def view_request(request_id):
     """View a specific request and download files."""
-    conn = sqlite3.connect('agentspace.db')
-    c = conn.cursor()
-    
-    # Get request details
-    c.execute('''
-        SELECT id, request_type, client_name, website, offerings, competitors, 
-               additional_info, status, json_output_path, docx_output_path, 
-               created_at, completed_at
-        FROM requests
-        WHERE id = ? AND user_id = ?
-    ''', (request_id, current_user.id))
-    
-    request_data = c.fetchone()
-    
-    if not request_data:
-        flash('Request not found', 'error')
-        return redirect(url_for('dashboard'))
-    
-    # Get uploaded files
-    c.execute('''
-        SELECT filename, file_type, uploaded_at
-        FROM uploaded_files
-        WHERE request_id = ?
-    ''', (request_id,))
-    
-    uploaded_files = c.fetchall()
-    conn.close()
+    with _db_pool.reader() as conn:
+        # Get request details
+        request_data = conn.execute('''
+            SELECT id, request_type, client_name, website, offerings, competitors, 
+                   additional_info, status, json_output_path, docx_output_path, 
+                   created_at, completed_at
+            FROM requests
+            WHERE id = ? AND user_id = ?
+        ''', (request_id, current_user.id)).fetchone()
+        
+        if not request_data:
+            flash('Request not found', 'error')
+            return redirect(url_for('dashboard'))
+        
+        # Get uploaded files
+        uploaded_files = conn.execute('''
+            SELECT filename, file_type, uploaded_at
+            FROM uploaded_files
+            WHERE request_id = ?
+        ''', (request_id,)).fetchall()
     
     return render_template('view_request.html', request=request_data, files=uploaded_files)
 
@@ -392,16 +345,12 @@ def view_request(request_id):
 @login_required
 def download_file(request_id, file_type):
     """Download generated files (JSON or DOCX)."""
-    conn = sqlite3.connect('agentspace.db')
-    c = conn.cursor()
-    c.execute('''
-        SELECT json_output_path, docx_output_path
-        FROM requests
-        WHERE id = ? AND user_id = ?
-    ''', (request_id, current_user.id))
-    
-    result = c.fetchone()
-    conn.close()
+    with _db_pool.reader() as conn:
+        result = conn.execute('''
+            SELECT json_output_path, docx_output_path
+            FROM requests
+            WHERE id = ? AND user_id = ?
+        ''', (request_id, current_user.id)).fetchone()
     
     if not result:
         flash('Request not found', 'error')
@@ -428,24 +377,18 @@ def admin_dashboard():
         flash('Access denied', 'error')
         return redirect(url_for('dashboard'))
     
-    conn = sqlite3.connect('agentspace.db')
-    c = conn.cursor()
-    
-    # Get all requests
-    c.execute('''
-        SELECT r.id, u.username, r.client_name, r.status, r.created_at
-        FROM requests r
-        JOIN users u ON r.user_id = u.id
-        ORDER BY r.created_at DESC
-        LIMIT 50
-    ''')
-    all_requests = c.fetchall()
-    
-    # Get all users
-    c.execute('SELECT id, username, email, is_admin, created_at FROM users')
-    all_users = c.fetchall()
-    
-    conn.close()
+    with _db_pool.reader() as conn:
+        # Get all requests
+        all_requests = conn.execute('''
+            SELECT r.id, u.username, r.client_name, r.status, r.created_at
+            FROM requests r
+            JOIN users u ON r.user_id = u.id
+            ORDER BY r.created_at DESC
+            LIMIT 50
+        ''').fetchall()
+        
+        # Get all users
+        all_users = conn.execute('SELECT id, username, email, is_admin, created_at FROM users').fetchall()
     
     return render_template('admin_dashboard.html', requests=all_requests, users=all_users)
 
@@ -454,6 +397,24 @@ def admin_dashboard():
 # PROCESSING LOGIC
 # ============================================================================
 
+# Completion-path statements. Kept as fixed module-level text so every
+# call hits the writer connection's prepared-statement cache.
+_FAIL_REQUEST_SQL = '''
+    UPDATE requests
+    SET status = 'failed',
+        json_output_path = ?,
+        docx_output_path = NULL,
+        completed_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+_COMPLETE_REQUEST_SQL = '''
+    UPDATE requests
+    SET status = 'completed',
+        json_output_path = ?,
+        docx_output_path = ?,
+        completed_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
 
 
 def process_marketing_kit_request(request_id, client_name, website, offerings, competitors, additional_info, uploaded_files, design_style="ai_powered", language_style="swift_innovation"):
@@ -465,8 +426,7 @@ def process_marketing_kit_request(request_id, client_name, website, offerings, c
     print("=" * 80)
     print()
 
-    # Import the helper function
-    from agentspace_inputs import prepare_inputs_with_defaults
+    safe_name = safe_filename(client_name)
 
     # Step 1: Prepare minimal form data
     form_data = {
@@ -478,30 +438,27 @@ def process_marketing_kit_request(request_id, client_name, website, offerings, c
     if website:
         form_data["website"] = website
     if offerings:
-        form_data["products_services"] = [s.strip() for s in offerings.split(',') if s.strip()]
+        form_data["products_services"] = list(filter(None, map(str.strip, offerings.split(','))))
     if competitors:
-        form_data["main_competitors"] = [c.strip() for c in competitors.split(',') if c.strip()]
+        form_data["main_competitors"] = list(filter(None, map(str.strip, competitors.split(','))))
     if additional_info:
         form_data["company_overview"] = additional_info
 
     # Step 2: Analyze all sources (website + files + form)
-    from agentspace_scrapers import analyze_all_sources
     enriched_profile = analyze_all_sources(
         website_url=website,
         uploaded_files=uploaded_files,
         form_data=form_data
     )
 
-    # Step 3: Prepare with defaults to ensure validation passes
+    # Step 3: Prepare with defaults to ensure validation passes (in place)
     validated_inputs = prepare_inputs_with_defaults(enriched_profile)
 
     # Step 4: Get design and language style objects
     # DESIGN SYSTEM
     if design_style == "ai_powered":
-        from agentspace_design_agent import get_design_for_company
         design_system = get_design_for_company(validated_inputs)
     elif design_style == "custom":
-        from agentspace_design_styles import create_custom_design_system
         # For demo, use a hardcoded custom config; in production, collect more fields from user
         design_system = create_custom_design_system(
             name="Custom",
@@ -511,11 +468,9 @@ def process_marketing_kit_request(request_id, client_name, website, offerings, c
             description="User custom mix"
         )
     else:
-        from agentspace_design_styles import get_design_system
         design_system = get_design_system(design_style)
 
     # LANGUAGE STYLE
-    from agentspace_language_styles import get_language_style, get_language_style_instructions
     language_style_obj = get_language_style(language_style)
     language_instructions = get_language_style_instructions(language_style_obj)
 
@@ -528,100 +483,45 @@ def process_marketing_kit_request(request_id, client_name, website, offerings, c
             "metadata": {},
             "errors": [enriched_profile['error']]
         }
-        json_filename = f"marketing_kit_{client_name.replace(' ', '_')}_{request_id}.json"
+        json_filename = f"marketing_kit_{safe_name}_{request_id}.json"
         json_path = os.path.join(app.config['OUTPUT_FOLDER'], json_filename)
-        # Sanitize before saving
-        safe_error_json = sanitize_unicode(error_json)
         log_id = request_id if request_id is not None else 'unknown'
         error_log_path = os.path.join(app.config['OUTPUT_FOLDER'], f"error_log_{log_id}.txt")
-        # Final surrogate scrub before saving
-        scrubbed_error_json = remove_surrogates_and_log(safe_error_json, log_path=error_log_path)
-        try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                f.write(json.dumps(scrubbed_error_json, indent=2, ensure_ascii=True))
-        except Exception as e:
-            # Log error and problematic data, always create a log file
-            try:
-                with open(error_log_path, 'a', encoding='utf-8', errors='replace') as log:
-                    log.write(f"Serialization error: {str(e)}\n\nData:\n{scrubbed_error_json}\n")
-                print(f"Serialization error logged to {error_log_path}")
-            except Exception as log_e:
-                print(f"Failed to write error log: {log_e}")
-            raise
+        write_json(json_path, error_json, error_log_path)
         # Optionally update DB status to failed
-        conn = sqlite3.connect('agentspace.db')
-        c = conn.cursor()
-        c.execute('''
-            UPDATE requests
-            SET status = 'failed',
-                json_output_path = ?,
-                docx_output_path = NULL,
-                completed_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (json_path, request_id))
-        conn.commit()
-        conn.close()
+        _db_batcher.submit(_FAIL_REQUEST_SQL, (json_path, request_id)).result()
         return error_json
     # If company_overview is present, clear error for downstream kit generation
-    if 'error' in enriched_profile and enriched_profile.get('company_overview'):
-        enriched_profile.pop('error', None)
-
-    # Also ensure error is not present in validated_inputs
-    if 'error' in validated_inputs:
-        validated_inputs.pop('error', None)
+    validated_inputs.pop('error', None)
 
     # Step 5: Generate marketing kit with enriched data and style controls
-    from agentspace_main_AI import run_marketing_kit_generation_AI
     # Inject language style instructions into each section prompt
     validated_inputs["language_instructions"] = language_instructions
     result = run_marketing_kit_generation_AI(validated_inputs, output_format="json", provider="claude")
 
     if result and result.success:
         # Save JSON output
-        json_filename = f"marketing_kit_{client_name.replace(' ', '_')}_{request_id}.json"
+        json_filename = f"marketing_kit_{safe_name}_{request_id}.json"
         json_path = os.path.join(app.config['OUTPUT_FOLDER'], json_filename)
 
-        # Sanitize before saving
-        safe_result = sanitize_unicode(result.to_dict())
+        result_dict = result.to_dict()
         log_id = request_id if request_id is not None else 'unknown'
         error_log_path = os.path.join(app.config['OUTPUT_FOLDER'], f"error_log_{log_id}.txt")
-        # Final surrogate scrub before saving
-        scrubbed_result = remove_surrogates_and_log(safe_result, log_path=error_log_path)
-        try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                f.write(json.dumps(scrubbed_result, indent=2, ensure_ascii=True))
-        except Exception as e:
-            # Log error and problematic data, always create a log file
-            try:
-                with open(error_log_path, 'a', encoding='utf-8', errors='replace') as log:
-                    log.write(f"Serialization error: {str(e)}\n\nData:\n{scrubbed_result}\n")
-                print(f"Serialization error logged to {error_log_path}")
-            except Exception as log_e:
-                print(f"Failed to write error log: {log_e}")
-            raise
-
-        # Generate DOCX and get the actual file path
-        from agentspace_docx_generator import generate_marketing_kit_docx
-        docx_path = generate_marketing_kit_docx(
-            company_name=client_name,
-            agent_results=result.output,
-            output_dir=app.config['OUTPUT_FOLDER'],
-            design_system=design_system
-        )
+        # JSON and DOCX outputs are independent, so write them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            json_future = executor.submit(write_json, json_path, result_dict, error_log_path)
+            docx_future = executor.submit(
+                generate_marketing_kit_docx,
+                company_name=client_name,
+                agent_results=result.output,
+                output_dir=app.config['OUTPUT_FOLDER'],
+                design_system=design_system
+            )
+            json_future.result()
+            docx_path = docx_future.result()
 
-        # Update database
-        conn = sqlite3.connect('agentspace.db')
-        c = conn.cursor()
-        c.execute('''
-            UPDATE requests
-            SET status = 'completed',
-                json_output_path = ?,
-                docx_output_path = ?,
-                completed_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-        ''', (json_path, docx_path, request_id))
-        conn.commit()
-        conn.close()
+        # Update database only once both files exist
+        _db_batcher.submit(_COMPLETE_REQUEST_SQL, (json_path, docx_path, request_id)).result()
 
         return result
     else:
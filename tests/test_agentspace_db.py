@@ -0,0 +1,124 @@
+"""
+Tests for agentspace_db: the per-pool writer lock, and WriteBatcher's
+grouping, failure isolation and batching window.
+
+Run with:  python -m unittest discover -s tests
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agentspace_db import SQLitePool, WriteBatcher
+
+
+class SQLitePoolWriterTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pool_a = SQLitePool(os.path.join(self._tmp.name, "a.db"), readers=0)
+        self.pool_b = SQLitePool(os.path.join(self._tmp.name, "b.db"), readers=0)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_nested_writer_raises_instead_of_deadlocking(self):
+        with self.pool_a.writer():
+            with self.assertRaises(RuntimeError):
+                with self.pool_a.writer():
+                    pass
+        # The outer checkout released the lock on exit
+        with self.pool_a.writer() as conn:
+            conn.execute("SELECT 1")
+
+    def test_writers_to_different_databases_do_not_wait_on_each_other(self):
+        done = threading.Event()
+
+        def write_b():
+            with self.pool_b.writer() as conn:
+                conn.execute("CREATE TABLE t (id INTEGER)")
+            done.set()
+
+        with self.pool_a.writer():
+            thread = threading.Thread(target=write_b)
+            thread.start()
+            self.assertTrue(done.wait(timeout=2))
+        thread.join()
+
+
+class WriteBatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "test.db")
+        self.pool = SQLitePool(self.path, readers=0)
+        with self.pool.writer() as conn:
+            conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)")
+            conn.execute("INSERT INTO t (id, v) VALUES (1, 'a'), (2, 'b'), (3, 'c')")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _values(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return dict(conn.execute("SELECT id, v FROM t"))
+        finally:
+            conn.close()
+
+    def test_concurrent_writes_share_one_transaction(self):
+        batcher = WriteBatcher(self.pool, interval=0.2)
+        commits = []
+        original = batcher._commit
+        batcher._commit = lambda batch: (commits.append(len(batch)), original(batch))
+        futures = [batcher.submit("UPDATE t SET v = ? WHERE id = ?", (f"x{i}", i)) for i in (1, 2, 3)]
+        for future in futures:
+            future.result(timeout=5)
+        self.assertEqual(commits, [3])
+        self.assertEqual(self._values(), {1: "x1", 2: "x2", 3: "x3"})
+
+    def test_bad_statement_only_fails_its_own_future(self):
+        batcher = WriteBatcher(self.pool, interval=0.2)
+        good_1 = batcher.submit("UPDATE t SET v = 'ok1' WHERE id = 1")
+        bad = batcher.submit("UPDATE missing_table SET v = 'nope'")
+        good_2 = batcher.submit("UPDATE t SET v = 'ok2' WHERE id = 2")
+        self.assertIsNone(good_1.result(timeout=5))
+        self.assertIsNone(good_2.result(timeout=5))
+        with self.assertRaises(sqlite3.OperationalError):
+            bad.result(timeout=5)
+        self.assertEqual(self._values(), {1: "ok1", 2: "ok2", 3: "c"})
+
+    def test_window_is_fixed_from_first_statement(self):
+        # Writes 40 ms apart would keep a sliding 50 ms window open for the
+        # whole burst; a fixed window commits the first batch after ~50 ms
+        batcher = WriteBatcher(self.pool, interval=0.05)
+        stop = threading.Event()
+
+        def trickle():
+            i = 0
+            while not stop.is_set():
+                batcher.submit("UPDATE t SET v = ? WHERE id = 3", (str(i),))
+                i += 1
+                time.sleep(0.04)
+
+        started = time.monotonic()
+        first = batcher.submit("UPDATE t SET v = 'first' WHERE id = 1")
+        thread = threading.Thread(target=trickle, daemon=True)
+        thread.start()
+        try:
+            first.result(timeout=5)
+            elapsed = time.monotonic() - started
+        finally:
+            stop.set()
+            thread.join()
+        self.assertLess(elapsed, 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
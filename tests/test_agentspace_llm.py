@@ -0,0 +1,80 @@
+"""
+Tests for BaseLLM's async client lifecycle under agenerate_many.
+
+Run with:  python -m unittest discover -s tests
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agentspace_llm import BaseLLM
+
+
+class StubAsyncClient:
+    """Stands in for AsyncAnthropic/AsyncOpenAI; counts opens and closes."""
+
+    opened = 0
+
+    def __init__(self, api_key=None, max_retries=None):
+        StubAsyncClient.opened += 1
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class StubLLM(BaseLLM):
+    __slots__ = ()
+
+    async def agenerate(self, prompt, delay=0.0, **kwargs):
+        client = self._async_client(StubAsyncClient)
+        await asyncio.sleep(delay)
+        # A request finishing on a closed client is the bug under test
+        return {"content": prompt, "success": not client.closed}
+
+
+class AgenerateManyTest(unittest.TestCase):
+
+    def setUp(self):
+        StubAsyncClient.opened = 0
+
+    def test_overlapping_batches_share_the_client_until_both_finish(self):
+        llm = StubLLM()
+
+        async def run():
+            short, long = await asyncio.gather(
+                llm.agenerate_many(["a", "b"], delay=0.01),
+                llm.agenerate_many(["c", "d"], delay=0.05),
+            )
+            return short, long
+
+        short, long = asyncio.run(run())
+        self.assertTrue(all(r["success"] for r in short + long))
+        self.assertEqual(StubAsyncClient.opened, 1)
+        self.assertIsNone(llm._aclient)
+
+    def test_client_opened_before_the_batch_stays_open(self):
+        llm = StubLLM()
+
+        async def run():
+            client = llm._async_client(StubAsyncClient)
+            await llm.agenerate_many(["a"])
+            return client
+
+        client = asyncio.run(run())
+        self.assertFalse(client.closed)
+        self.assertIs(llm._aclient, client)
+
+    def test_new_event_loop_gets_a_new_client(self):
+        llm = StubLLM()
+        asyncio.run(llm.agenerate_many(["a"]))
+        asyncio.run(llm.agenerate_many(["b"]))
+        self.assertEqual(StubAsyncClient.opened, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()